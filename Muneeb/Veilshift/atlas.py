@@ -0,0 +1,71 @@
+# atlas.py
+import json
+import os
+import pygame
+
+
+class SpriteAtlas:
+    """
+    Many small sprites packed into one page surface plus a region table
+    (name -> Rect on the page).
+
+    sprite(name) is a subsurface of the page, so it can be blitted like any
+    other surface; blits() draws a list of regions in one Surface.blits
+    call. save() / load() keep a packed atlas on disk as <base>.png and
+    <base>.json, so the next run decodes one PNG instead of every sprite.
+    """
+    def __init__(self, page, regions):
+        self.page = page
+        self.regions = {name: pygame.Rect(rect) for name, rect in regions.items()}
+        self._sprites = {}
+
+    @classmethod
+    def pack(cls, sprites, width=1024, padding=1):
+        """Shelf-pack {name: surface}, tallest first, into rows at most width px wide."""
+        regions = {}
+        x = y = shelf = 0
+        for name in sorted(sprites, key=lambda n: (-sprites[n].get_height(), n)):
+            w, h = sprites[name].get_size()
+            if x and x + w > width:
+                x, y, shelf = 0, y + shelf + padding, 0
+            regions[name] = (x, y, w, h)
+            x += w + padding
+            shelf = max(shelf, h)
+
+        page_w = max((r[0] + r[2] for r in regions.values()), default=1)
+        page = pygame.Surface((max(1, page_w), max(1, y + shelf)), pygame.SRCALPHA)
+        for name, rect in regions.items():
+            # MAX onto the clear page copies pixels exactly, alpha included
+            page.blit(sprites[name], rect[:2], special_flags=pygame.BLEND_RGBA_MAX)
+        return cls(page.convert_alpha(), regions)
+
+    # ---------------- DISK CACHE ----------------
+    @classmethod
+    def load(cls, base, load_page=None):
+        """load_page(path) returns the page surface, e.g. AssetCache.acquire; default decodes it."""
+        with open(base + ".json") as f:
+            regions = json.load(f)
+        if load_page is None:
+            return cls(pygame.image.load(base + ".png").convert_alpha(), regions)
+        return cls(load_page(base + ".png"), regions)
+
+    def save(self, base):
+        """Write <base>.png then <base>.json; the .json only appears once both are complete."""
+        os.makedirs(os.path.dirname(base) or ".", exist_ok=True)
+        pygame.image.save(self.page, base + ".tmp.png")
+        os.replace(base + ".tmp.png", base + ".png")
+        with open(base + ".tmp.json", "w") as f:
+            json.dump({name: list(rect) for name, rect in self.regions.items()}, f)
+        os.replace(base + ".tmp.json", base + ".json")
+
+    # ---------------- DRAWING ----------------
+    def sprite(self, name):
+        sprite = self._sprites.get(name)
+        if sprite is None:
+            sprite = self._sprites[name] = self.page.subsurface(self.regions[name])
+        return sprite
+
+    def blits(self, target, items):
+        """Draw (name, dest) pairs with a single target.blits call."""
+        page, regions = self.page, self.regions
+        target.blits([(page, dest, regions[name]) for name, dest in items], doreturn=False)
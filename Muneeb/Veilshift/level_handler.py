@@ -1,14 +1,20 @@
 # level_handler.py
 import pygame
 from platform import Platform, HookPlatform
+from light import Light
+from settings import MASK_INFO, GRID_CELL_SIZE, DDA_CELL_SIZE, MAX_CONE_RADIUS, DEMO_LIGHTS
+from mask_layer import MaskLayer
+from spatial_hash import SpatialHash
 
 class LevelHandler:
     """
     Ultimate Level Handler
     ---------------------
     - Loads levels from a mega dictionary
-    - Builds platforms, hooks, exits, and other objects
+    - Builds platforms, hooks, exits, lights, and other objects
     - Adds infinite side walls automatically
+    - Indexes the active platforms of every mask once per load
+    - Owns the spatial hash shared by collision, lighting and scans
     - Supports level transitions and metadata queries
     """
 
@@ -19,9 +25,13 @@ class LevelHandler:
         self.current_level_id = 0
         self.platforms = []
         self.exit_rect = None
+        self.lights = []
         self.extra_objects = []  # For future extendable things
+        self.mask_index = {}  # mask -> MaskLayer, rebuilt by load_level
+        self.platform_grid = SpatialHash(GRID_CELL_SIZE)  # every platform, for collision
 
         self.levels = self._define_levels()
+        self.demo_lights = self._define_demo_lights() if DEMO_LIGHTS else {}
 
     # ---------------- MEGA TABLE ----------------
     def _define_levels(self):
@@ -54,6 +64,23 @@ class LevelHandler:
             },
         }
 
+    def _define_demo_lights(self):
+        """
+        Example static / flickering / cone lights per level, only added with
+        DEMO_LIGHTS. Levels list their own under "lights" in the same format.
+        """
+        return {
+            0: [
+                # x, y, radius, options (Light keyword args)
+                (90, 420, 220, {"flicker": 0.3}),
+                (1000, 120, 340, {"kind": "cone", "angle": 100, "fov": 50, "intensity": 170}),
+            ],
+            1: [
+                (420, 330, 200, {"flicker": 0.3}),
+                (1060, 260, 240, {"flicker": 0.25, "intensity": 180}),
+            ],
+        }
+
     # ---------------- LOAD LEVEL ----------------
     def load_level(self, level_id):
         """Load level by ID and return platforms and exit rect"""
@@ -79,12 +106,56 @@ class LevelHandler:
         for hx, hy, radius in level_data.get("hooks", []):
             self.platforms.append(HookPlatform((hx, hy, 0, 0), radius=radius))
 
+        # Lights
+        self.lights = [
+            Light((lx, ly), radius, **options)
+            for lx, ly, radius, options in level_data.get("lights", []) + self.demo_lights.get(level_id, [])
+        ]
+
         # Exit
         ex, ey, ew, eh = level_data.get("exit", (self.width - 120, self.height - 80, 80, 80))
         self.exit_rect = pygame.Rect(ex, ey, ew, eh)
 
+        self.platform_grid = SpatialHash.from_items(self.platforms, GRID_CELL_SIZE)
+        self.mask_index = self._build_mask_index()
+
         return self.platforms, self.exit_rect
 
+    # ---------------- MASK INDEX ----------------
+    def _build_mask_index(self):
+        """
+        Freeze, per mask, which platforms are active, their rects as an
+        (M, 4) array and a spatial hash over them. Lighting then reads a
+        ready-made set instead of calling visible() on every platform every
+        ray, and a mask switch is just a different key.
+
+        No PVS is baked (MaskLayer.bake_visibility): nothing here runs
+        sight checks, so it would only cost load time.
+        """
+        # Occupancy covers the walled play area plus one full cone of slack;
+        # the 20000 px walls are clipped to it
+        pad = MAX_CONE_RADIUS
+        bounds = (-50 - pad, -pad, self.width + 50 + pad, self.height + pad)
+
+        index = {}
+        for mask in MASK_INFO:
+            layer = MaskLayer((p for p in self.platforms if p.visible(mask)), GRID_CELL_SIZE)
+            layer.bake_occupancy(DDA_CELL_SIZE, bounds)
+            index[mask] = layer
+        return index
+
+    def active_platforms(self, mask):
+        """Platforms that exist under this mask."""
+        return self.mask_index[mask].platforms
+
+    def occluder_rects(self, mask):
+        """Read-only (M, 4) rect array of the platforms that block light under this mask."""
+        return self.mask_index[mask].rects
+
+    def platforms_near(self, rect):
+        """Platforms touching rect, whatever the mask."""
+        return self.platform_grid.query_rect(rect)
+
     # ---------------- NEXT LEVEL ----------------
     def next_level(self):
         """Load the next level if it exists"""
@@ -0,0 +1,37 @@
+# light.py
+import math
+
+
+class Light:
+    """
+    A level light (torch, lamp...) that cuts its own visibility polygon out
+    of the darkness, shadowed by the same platforms as the player's cone.
+
+    kind:      "point" lights all round; "cone" uses angle / fov (degrees)
+    intensity: alpha cut out of the darkness, 255 = fully lit
+    flicker:   0..1, how far the intensity dips. Only the brightness
+               flickers, never the polygon, so flickering torches stay cached
+    static:    the light never moves, so LightSystem casts its polygon once
+               per level and mask. Set False for lights game code moves
+               (pos / angle) and it is recast every frame
+    """
+    def __init__(self, pos, radius, kind="point", angle=0, fov=90, intensity=200, flicker=0.0, static=True):
+        self.pos = (pos[0], pos[1])
+        self.radius = radius
+        self.kind = kind
+        self.angle = angle
+        self.fov = 360 if kind == "point" else fov
+        self.intensity = intensity
+        self.flicker = flicker
+        self.static = static
+
+        # Per-light phase so neighbouring torches don't flicker in step
+        self.phase = (self.pos[0] * 0.37 + self.pos[1] * 0.11) % (2 * math.pi)
+
+    def current_intensity(self, t):
+        """Intensity at time t (seconds)."""
+        if not self.flicker:
+            return self.intensity
+        # two detuned sines read as an irregular flame
+        n = 0.5 + 0.25 * (math.sin(t * 7.3 + self.phase) + math.sin(t * 13.1 + self.phase * 1.7))
+        return int(self.intensity * (1 - self.flicker * n))
@@ -0,0 +1,158 @@
+# light_mask.py
+import math
+import pygame
+import numpy as np
+
+
+class LightMask:
+    """
+    1-bit raster of the lit area, for O(1) "is this lit?" lookups.
+
+    Only the bounding box of the light is stored, as a numpy bool array
+    indexed [x, y] like surfarray. offset is the position of its top-left
+    corner in the caller's coordinate space and scale is bitmap pixels per
+    caller pixel. Batch queries are plain numpy indexing: one gather for
+    all points, four summed-area lookups per rect.
+    """
+    def __init__(self):
+        self.bits = None
+        self.offset = (0, 0)
+        self.scale = 1
+        self._sums = None  # summed-area table of bits, built by the first lit_rects
+        self._scratch = None
+
+    def clear(self):
+        self.bits = None
+        self.offset = (0, 0)
+        self.scale = 1
+        self._sums = None
+
+    # ---------------- BUILD ----------------
+    def from_polygon(self, polygon):
+        """Rasterize a polygon (list of (x, y)) exactly as pygame.draw.polygon fills it."""
+        xs = [p[0] for p in polygon]
+        ys = [p[1] for p in polygon]
+        left, top = math.floor(min(xs)), math.floor(min(ys))
+        w = math.ceil(max(xs)) - left + 1
+        h = math.ceil(max(ys)) - top + 1
+
+        # Reuse one scratch surface, growing it only when the light does
+        if self._scratch is None or self._scratch.get_width() < w or self._scratch.get_height() < h:
+            size = (max(w, self._scratch.get_width() if self._scratch else 0),
+                    max(h, self._scratch.get_height() if self._scratch else 0))
+            self._scratch = pygame.Surface(size, 0, 32)
+
+        area = self._scratch.subsurface((0, 0, w, h))
+        area.fill((0, 0, 0))
+        pygame.draw.polygon(area, (255, 255, 255), [(x - left, y - top) for x, y in polygon])
+
+        pixels = pygame.surfarray.pixels2d(area)
+        self.bits = pixels != 0
+        del pixels  # unlock the scratch surface
+        self.offset = (left, top)
+        self.scale = 1
+        self._sums = None
+
+    def from_surface(self, surface, rect=None, offset=(0, 0), threshold=127, scale=1):
+        """
+        Bits of the pixels of surface (optionally only inside rect) whose
+        alpha is above threshold. offset shifts surface coordinates into the
+        caller's space (e.g. the camera offset for a screen-space buffer).
+        An 8-bit surface is read as a grayscale intensity plane instead:
+        lit where the value is above threshold.
+        scale is surface pixels per caller pixel (0.5 for a half-res
+        buffer); queries are mapped down to it rather than the bits up.
+        """
+        if rect is None:
+            rect = surface.get_rect()
+        rect = pygame.Rect(rect).clip(surface.get_rect())
+        if rect.width == 0 or rect.height == 0:
+            self.clear()
+            return
+
+        area = surface.subsurface(rect)
+        if surface.get_bitsize() == 8:
+            values = pygame.surfarray.pixels2d(area)
+        else:
+            values = pygame.surfarray.pixels_alpha(area)
+        self.bits = values > threshold
+        del values  # unlock the surface
+        self.offset = (rect.x / scale + offset[0], rect.y / scale + offset[1])
+        self.scale = scale
+        self._sums = None
+
+    # ---------------- QUERIES ----------------
+    def _spans(self, x, y, w, h):
+        """Caller-space rects (scalars or arrays) -> clipped bitmap x0, y0, x1, y1."""
+        s = self.scale
+        bw, bh = self.bits.shape
+        x0 = np.clip(np.floor((x - self.offset[0]) * s), 0, bw).astype(int)
+        y0 = np.clip(np.floor((y - self.offset[1]) * s), 0, bh).astype(int)
+        x1 = np.clip(np.ceil((x + w - self.offset[0]) * s), 0, bw).astype(int)
+        y1 = np.clip(np.ceil((y + h - self.offset[1]) * s), 0, bh).astype(int)
+        return x0, y0, x1, y1
+
+    def _summed_area(self):
+        if self._sums is None:
+            bw, bh = self.bits.shape
+            sums = np.zeros((bw + 1, bh + 1), dtype=np.int32)
+            np.cumsum(self.bits, axis=0, dtype=np.int32, out=sums[1:, 1:])
+            np.cumsum(sums[1:, 1:], axis=1, out=sums[1:, 1:])
+            self._sums = sums
+        return self._sums
+
+    def is_point_lit(self, point):
+        if self.bits is None:
+            return False
+        x = math.floor((point[0] - self.offset[0]) * self.scale)
+        y = math.floor((point[1] - self.offset[1]) * self.scale)
+        w, h = self.bits.shape
+        return 0 <= x < w and 0 <= y < h and bool(self.bits[x, y])
+
+    def lit_points(self, points):
+        """Bool array, one entry per (x, y): is_point_lit for many points in one gather."""
+        pts = np.fromiter((v for p in points for v in p), dtype=float).reshape(-1, 2)
+        lit = np.zeros(len(pts), dtype=bool)
+        if self.bits is None or len(pts) == 0:
+            return lit
+        w, h = self.bits.shape
+        xs = np.floor((pts[:, 0] - self.offset[0]) * self.scale).astype(int)
+        ys = np.floor((pts[:, 1] - self.offset[1]) * self.scale).astype(int)
+        inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+        lit[inside] = self.bits[xs[inside], ys[inside]]
+        return lit
+
+    def lit_rects(self, rects):
+        """
+        Bool array, one entry per (x, y, w, h): is_rect_lit (any pixel lit)
+        for many rects at once, from a summed-area table of the bits that is
+        built on the first call after each rebuild.
+        """
+        # fromiter over the flat values: several times cheaper than np.array on Rects
+        boxes = np.fromiter((v for r in rects for v in r), dtype=int).reshape(-1, 4)
+        if self.bits is None or len(boxes) == 0:
+            return np.zeros(len(boxes), dtype=bool)
+        x0, y0, x1, y1 = self._spans(boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3])
+        sums = self._summed_area()
+        # Clipped-away rects have x0 == x1 or y0 == y1, so they count 0
+        return sums[x1, y1] - sums[x0, y1] - sums[x1, y0] + sums[x0, y0] > 0
+
+    def lit_area(self, rect):
+        """Number of lit (caller-space) pixels inside rect."""
+        if self.bits is None:
+            return 0
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            return 0
+        x0, y0, x1, y1 = self._spans(*rect)
+        return round(np.count_nonzero(self.bits[x0:x1, y0:y1]) / self.scale ** 2)
+
+    def is_rect_lit(self, rect):
+        """True if any pixel of rect is lit."""
+        if self.bits is None:
+            return False
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            return False
+        x0, y0, x1, y1 = self._spans(*rect)
+        return bool(self.bits[x0:x1, y0:y1].any())
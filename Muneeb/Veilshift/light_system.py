@@ -1,63 +1,308 @@
 # light_system.py
 import pygame
 import math
-import random
-from settings import RAY_COUNT, RAY_STEP, FOV_ANGLE, AMBIENT_DARK
+import numpy as np
+from settings import (
+    FOV_ANGLE, AMBIENT_DARK, LIGHT_ENGINE, SWEEP_ARC_TOLERANCE, DDA_REFINE,
+    RAY_REUSE_DISTANCE, RAY_REUSE_ANGLE, ADAPTIVE_BASE_RAYS, ADAPTIVE_ANGLE_TOLERANCE,
+    QUALITY_PRESETS, QUALITY, GRAIN_TILE_SIZE, GRAIN_SEED
+)
+from raycast import cast_rays, fan_angles, rects_to_array, to_point_list
+from visibility import sweep_polygon
+from light_mask import LightMask
 
 class LightSystem:
-    def __init__(self, width, height):
+    def __init__(self, width, height, quality=QUALITY):
         self.width = width
         self.height = height
+        self.grain_offset = 0
+
+        # 1-bit copy of the vision mask, rebuilt lazily on the first lit query
+        self.light_mask = LightMask()
+        self.light_mask_dirty = False
+        self.vision_bounds = None
+        self.camera_offset = (0, 0)
+
+        self.set_quality(quality)
+
+        # Per-mask occluder rects from LevelHandler; None = filter platforms per call
+        self.occluder_index = None
+
+        # Level torches etc. (light.Light); static polygons cached per (light, mask)
+        self.lights = []
+        self.static_polygons = {}
+
+        # Last frame's fan, reused ray by ray while the light holds still
+        self.ray_cache = None
+        self.ray_stats = {"reused": 0, "cast": 0}
+
+    # ---------------- QUALITY ----------------
+    def set_quality(self, name):
+        """
+        Switch to a QUALITY_PRESETS tier. The darkness and vision buffers
+        are (re)built at light_scale of the screen and upscaled into
+        output_surface when drawn.
+
+        The vision mask is an 8-bit intensity plane (grayscale palette,
+        0 = dark, 255 = fully lit) written straight into the darkness
+        overlay's alpha channel in draw_light.
+
+        The grain is its own layer, a buffer plus one seamless tile wide so
+        any (wrapped) scroll offset is one contiguous area of it. Scrolling
+        it never touches the darkness, so the darkness is only redrawn where
+        the vision was or is. At scale 1 draw_grain() lays it over the
+        screen; reduced tiers lay it over overlay_surface, a per-frame copy
+        of the small buffer, just before the upscale, which rewrites every
+        output pixel anyway.
+        """
+        preset = QUALITY_PRESETS[name]
+
+        # Last frame's lit area must be read before its buffer is replaced
+        self._current_light_mask()
+
+        self.quality = name
+        self.scale = preset["light_scale"]
+        self.smooth_upscale = preset["smooth_upscale"]
+        self.ray_count = preset["ray_count"]
+        self.ray_budget = preset["adaptive_ray_budget"]
+        self.animate_grain = preset["animate_grain"]
+        self.ray_cache = None
+
+        buffer_size = (max(1, round(self.width * self.scale)), max(1, round(self.height * self.scale)))
 
         # Darkness overlay (ALWAYS on top)
-        self.dark_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.dark_surface = pygame.Surface(buffer_size, pygame.SRCALPHA)
 
-        # Vision mask (used to CUT holes)
-        self.vision_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        # Vision mask (used to CUT holes), one byte per pixel
+        self.vision_surface = pygame.Surface(buffer_size, depth=8)
+        self.vision_surface.set_palette([(i, i, i) for i in range(256)])
+        self.vision_surface.fill(0)
 
-        # Cheap animated void grain (darkness only)
-        self.grain_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-        for y in range(0, height, 2):
-            for x in range(0, width, 2):
-                a = random.randint(8, 22)
-                self.grain_surface.fill((0, 0, 0, a), (x, y, 2, 2))
+        # Cheap animated void grain
+        self.grain_tile = self._build_grain_tile(round(GRAIN_TILE_SIZE * self.scale), max(1, round(2 * self.scale)))
+        tile = self.grain_tile.get_width()
+        self.grain_strip = pygame.Surface((buffer_size[0] + tile, buffer_size[1]), pygame.SRCALPHA)
+        for y in range(0, buffer_size[1], tile):
+            for x in range(0, buffer_size[0] + tile, tile):
+                self.grain_strip.blit(self.grain_tile, (x, y))
 
-        self.grain_offset = 0
+        # Area of dark_surface that is not plain darkness (None = all of it)
+        self.dirty_rect = None
+        self.vision_bounds = None
+
+        # Darkness + grain and its full-res upscale; unused at scale 1
+        self.overlay_surface = None
+        self.output_surface = None
+        if self.scale != 1:
+            self.overlay_surface = pygame.Surface(buffer_size, pygame.SRCALPHA)
+            self.output_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+
+    def _build_grain_tile(self, size, cell):
+        """Seamless size x size tile of black cell x cell specks, alpha 8..22."""
+        cells = -(-size // cell)
+        rng = np.random.default_rng(GRAIN_SEED)
+        alpha = rng.integers(8, 23, size=(cells, cells), dtype=np.uint8)
+        alpha = alpha.repeat(cell, axis=0).repeat(cell, axis=1)[:size, :size]
+
+        tile = pygame.Surface((size, size), pygame.SRCALPHA)
+        pixels = pygame.surfarray.pixels_alpha(tile)
+        pixels[:] = alpha
+        del pixels  # unlock the surface
+        return tile
 
     # ---------------- RAYCAST ----------------
+    def set_occluder_index(self, mask_index):
+        """Use a LevelHandler mask index (mask -> MaskLayer) for occluders."""
+        self.occluder_index = mask_index
+        self.invalidate_rays()
+        self.static_polygons = {}
+
+    def invalidate_rays(self, rect=None):
+        """
+        Forget cached rays. With a rect (e.g. where a moving occluder was, or
+        now is), only the rays whose cached segment touches it are dropped.
+        """
+        cache = self.ray_cache
+        if rect is None or cache is None:
+            self.ray_cache = None
+            return
+        rect = pygame.Rect(rect)
+        _, dists, hits = cast_rays(cache["origin"], cache["angles"], rects_to_array([rect]), cache["radius"])
+        touched = (hits >= 0) & (dists <= cache["dists"])
+        cache["dists"][touched] = np.nan
+
+    def reset_ray_stats(self):
+        self.ray_stats = {"reused": 0, "cast": 0}
+
+    def occluders(self, platforms, current_mask, origin=None, radius=None):
+        """
+        Rect array of the platforms that block vision for this mask. With an
+        index and an origin/radius, only the occluders the spatial hash finds
+        within reach are returned.
+        """
+        if self.occluder_index and current_mask in self.occluder_index:
+            layer = self.occluder_index[current_mask]
+            if origin is None:
+                return layer.rects
+            return layer.rects_near(origin, radius)[1]
+        return rects_to_array([p.rect for p in platforms if p.visible(current_mask)])
+
+    def cast_angles(self, origin, angles, max_radius, platforms, current_mask):
+        """
+        Cast a batch of rays with the configured engine.
+        Returns (points, dists, hit_ids) like raycast.cast_rays; with an
+        occluder index every engine's hit_ids are MaskLayer rows, so equal
+        ids from different casts are the same platform.
+        """
+        if self.occluder_index and current_mask in self.occluder_index:
+            layer = self.occluder_index[current_mask]
+            if LIGHT_ENGINE == "dda" and layer.occupancy is not None:
+                return layer.occupancy.cast_rays(origin, angles, max_radius, DDA_REFINE)
+            return layer.cast_rays(origin, angles, max_radius)
+        rects = self.occluders(platforms, current_mask)
+        return cast_rays(origin, angles, rects, max_radius)
+
     def cast_ray(self, origin, angle, platforms, max_radius, current_mask):
-        ox, oy = origin
-        rad = math.radians(angle)
-        dx, dy = math.cos(rad), math.sin(rad)
+        points, _, _ = self.cast_angles(origin, (angle,), max_radius, platforms, current_mask)
+        return (float(points[0, 0]), float(points[0, 1]))
 
-        for dist in range(0, int(max_radius), RAY_STEP):
-            px = ox + dx * dist
-            py = oy + dy * dist
+    def cast_coherent(self, origin, angles, max_radius, platforms, current_mask):
+        """
+        cast_angles, reusing last call's result for every ray that can't
+        have changed: same mask, light within RAY_REUSE_DISTANCE of where the
+        cache was cast, same angle, and either a hit or a radius that didn't
+        grow. Everything else is recast in one batch. Cached hit_ids are
+        MaskLayer rows (see cast_angles), so reused and recast ids agree.
+        """
+        angles = np.asarray(angles, dtype=float)
+        dists = np.full(len(angles), np.nan)
+        hit_ids = np.full(len(angles), -1)
+
+        cache = self.ray_cache
+        if (cache is not None and cache["mask"] == current_mask and len(cache["angles"])
+                and math.dist(cache["origin"], origin) <= RAY_REUSE_DISTANCE):
+            # Line the new angles up with the cached ones (wrap-safe, sorted lookup)
+            base = cache["angles"][0]
+            old_rel = (cache["angles"] - base) % 360
+            order = np.argsort(old_rel)
+            old_rel = old_rel[order]
+            new_rel = (angles - base) % 360
+            right = np.clip(np.searchsorted(old_rel, new_rel), 0, len(old_rel) - 1)
+            left = np.clip(right - 1, 0, len(old_rel) - 1)
+            nearest = np.where(np.abs(old_rel[left] - new_rel) < np.abs(old_rel[right] - new_rel), left, right)
+            matched = np.abs(old_rel[nearest] - new_rel) <= RAY_REUSE_ANGLE
+            slot = order[nearest]
+
+            old_dists = cache["dists"][slot]
+            old_hits = cache["hit_ids"][slot]
+            reuse = matched & ~np.isnan(old_dists) & ((old_hits >= 0) | (max_radius <= cache["radius"]))
+
+            # A hit past a shrunken radius is just a miss at the new radius
+            dists[reuse] = np.minimum(old_dists[reuse], max_radius)
+            hit_ids[reuse] = np.where(old_dists[reuse] > max_radius, -1, old_hits[reuse])
+            anchor = cache["origin"]
+        else:
+            anchor = origin
+
+        stale = np.isnan(dists)
+        if stale.any():
+            _, dists[stale], hit_ids[stale] = self.cast_angles(
+                origin, angles[stale], max_radius, platforms, current_mask
+            )
+        self.ray_stats["cast"] += int(stale.sum())
+        self.ray_stats["reused"] += int(len(angles) - stale.sum())
 
-            for p in platforms:
-                # Only block vision if platform is visible
-                if not p.visible(current_mask):
-                    continue
-                if p.rect.collidepoint(px, py):
-                    return (px, py)
+        # Keep the anchor while reusing, so small drifts can't add up past the threshold
+        self.ray_cache = {
+            "origin": anchor,
+            "mask": current_mask,
+            "radius": max_radius,
+            "angles": angles,
+            "dists": dists.copy(),
+            "hit_ids": hit_ids,
+        }
 
-        return (ox + dx * max_radius, oy + dy * max_radius)
+        rad = np.radians(angles)
+        points = np.column_stack((origin[0] + np.cos(rad) * dists, origin[1] + np.sin(rad) * dists))
+        return points, dists, hit_ids
+
+    def get_ray_polygon(self, origin, facing_angle, cone_radius, platforms, current_mask):
+        """Fixed fan of ray_count + 1 rays; unchanged rays come from last frame."""
+        angles = fan_angles(facing_angle - FOV_ANGLE / 2, FOV_ANGLE, self.ray_count)
+        points, _, _ = self.cast_coherent(origin, angles, cone_radius, platforms, current_mask)
+        return to_point_list(origin, points)
+
+    def get_adaptive_polygon(self, origin, facing_angle, cone_radius, platforms, current_mask):
+        """
+        Coarse fan of ADAPTIVE_BASE_RAYS, then bisect only where neighbouring
+        rays can't be joined by a straight edge: they hit different platforms,
+        or the same platform on different faces (a corner), or one hits and
+        one misses. Rays stop splitting below ADAPTIVE_ANGLE_TOLERANCE or
+        when the quality tier's ray budget has been spent. Each round of
+        bisection is cast as one batch.
+        """
+        angles = fan_angles(facing_angle - FOV_ANGLE / 2, FOV_ANGLE, ADAPTIVE_BASE_RAYS)
+        points, dists, hit_ids = self.cast_coherent(origin, angles, cone_radius, platforms, current_mask)
+        budget = self.ray_budget
+
+        while budget > 0:
+            a0, a1 = angles[:-1], angles[1:]
+            h0, h1 = hit_ids[:-1], hit_ids[1:]
+            p0, p1 = points[:-1], points[1:]
+
+            # One straight edge covers the gap if both rays miss (the arc is
+            # fine at base resolution) or both hit one face of one platform
+            same_face = (np.abs(p0[:, 0] - p1[:, 0]) < 1e-6) | (np.abs(p0[:, 1] - p1[:, 1]) < 1e-6)
+            joined = ((h0 < 0) & (h1 < 0)) | ((h0 == h1) & (h0 >= 0) & same_face)
+            split = np.flatnonzero(~joined & (a1 - a0 > ADAPTIVE_ANGLE_TOLERANCE))
+            if len(split) == 0:
+                break
+
+            # Over budget: biggest depth jumps first, they are the most visible
+            if len(split) > budget:
+                jump = np.abs(dists[split] - dists[split + 1])
+                split = np.sort(split[np.argsort(-jump, kind="stable")[:budget]])
+            budget -= len(split)
+
+            mids = (angles[split] + angles[split + 1]) / 2
+            m_points, m_dists, m_hits = self.cast_angles(origin, mids, cone_radius, platforms, current_mask)
+            self.ray_stats["cast"] += len(mids)
+
+            # Slot each midpoint in after its left neighbour
+            at = split + 1
+            angles = np.insert(angles, at, mids)
+            points = np.insert(points, at, m_points, axis=0)
+            dists = np.insert(dists, at, m_dists)
+            hit_ids = np.insert(hit_ids, at, m_hits)
+
+        return to_point_list(origin, points)
+
+    def get_sweep_polygon(self, origin, facing_angle, cone_radius, platforms, current_mask):
+        """Exact polygon from an angular sweep over occluder corners."""
+        rects = self.occluders(platforms, current_mask, origin, cone_radius)
+        return sweep_polygon(origin, facing_angle, FOV_ANGLE, cone_radius, rects, SWEEP_ARC_TOLERANCE)
 
     def get_vision_polygon(self, origin, facing_angle, cone_radius, platforms, current_mask):
+        if LIGHT_ENGINE == "sweep":
+            raw = self.get_sweep_polygon(origin, facing_angle, cone_radius, platforms, current_mask)
+        elif LIGHT_ENGINE == "adaptive":
+            raw = self.get_adaptive_polygon(origin, facing_angle, cone_radius, platforms, current_mask)
+        else:
+            raw = self.get_ray_polygon(origin, facing_angle, cone_radius, platforms, current_mask)
+
         points = [origin]
         start_angle = facing_angle - FOV_ANGLE / 2
-        step = FOV_ANGLE / RAY_COUNT
+        step = FOV_ANGLE / self.ray_count
         t = pygame.time.get_ticks() * 0.002
 
-        for i in range(RAY_COUNT + 1):
-            angle = start_angle + i * step
-            px, py = self.cast_ray(origin, angle, platforms, cone_radius, current_mask)
+        for px, py in raw[1:]:
+            dx, dy = px - origin[0], py - origin[1]
+            ang = math.atan2(dy, dx)
 
-            # subtle organic edge wobble
+            # subtle organic edge wobble (phase follows the angle, so any engine matches the ray fan)
+            i = ((math.degrees(ang) - start_angle + 180) % 360 - 180) / step
             wobble = math.sin(i * 0.6 + t) * 1.2
-            dx, dy = px - origin[0], py - origin[1]
             length = max(0, math.hypot(dx, dy) + wobble)
-            ang = math.atan2(dy, dx)
 
             points.append((
                 origin[0] + math.cos(ang) * length,
@@ -66,6 +311,62 @@ class LightSystem:
 
         return points
 
+    # ---------------- LEVEL LIGHTS ----------------
+    def set_lights(self, lights):
+        """Level lights (light.Light) to draw with the player's vision."""
+        self.lights = list(lights)
+        self.static_polygons = {}
+
+    def get_light_polygon(self, index, platforms, current_mask):
+        """
+        WORLD-space visibility polygon of self.lights[index]. Static lights
+        get the exact sweep polygon, cast once per mask until the level or
+        the lights change; dynamic ones are a ray fan recast every call.
+        """
+        light = self.lights[index]
+        if light.static:
+            key = (index, current_mask)
+            poly = self.static_polygons.get(key)
+            if poly is None:
+                rects = self.occluders(platforms, current_mask, light.pos, light.radius)
+                poly = sweep_polygon(light.pos, light.angle, light.fov, light.radius, rects, SWEEP_ARC_TOLERANCE)
+                self.static_polygons[key] = poly
+            return poly
+
+        ray_count = max(2, round(self.ray_count * light.fov / FOV_ANGLE))
+        angles = fan_angles(light.angle - light.fov / 2, light.fov, ray_count)
+        points, _, _ = self.cast_angles(light.pos, angles, light.radius, platforms, current_mask)
+        return to_point_list(light.pos, points)
+
+    def draw_level_lights(self, platforms, current_mask, camera_offset):
+        """
+        Draw every on-screen level light into vision_surface at its current
+        intensity. Returns the buffer rect they cover, or None.
+        """
+        if not self.lights:
+            return None
+
+        s = self.scale
+        cam_x, cam_y = camera_offset
+        screen_rect = pygame.Rect(0, 0, self.width, self.height)
+        t = pygame.time.get_ticks() * 0.001
+
+        visible = []
+        for index, light in enumerate(self.lights):
+            x, y = light.pos[0] - cam_x, light.pos[1] - cam_y
+            reach = pygame.Rect(x - light.radius, y - light.radius, light.radius * 2, light.radius * 2)
+            if reach.colliderect(screen_rect):
+                visible.append((light.current_intensity(t), index))
+        visible.sort()
+
+        drawn = None
+        for intensity, index in visible:
+            poly = self.get_light_polygon(index, platforms, current_mask)
+            poly = [((x - cam_x) * s, (y - cam_y) * s) for x, y in poly]
+            rect = pygame.draw.polygon(self.vision_surface, (intensity, intensity, intensity), poly)
+            drawn = rect if drawn is None else drawn.union(rect)
+        return drawn
+
     # ---------------- DRAW VISION ----------------
     def draw_light(
         self,
@@ -87,21 +388,30 @@ class LightSystem:
         oy = origin[1] - camera_offset[1]
         screen_origin = (int(ox), int(oy))
 
-        # 1️⃣ Full darkness
-        self.dark_surface.fill(AMBIENT_DARK)
+        # Screen → light buffer (same thing at scale 1)
+        s = self.scale
+        buffer_origin = (int(ox * s), int(oy * s))
+
+        # 1️⃣ Reset vision mask (only last frame's drawing, the rest is still clear)
+        if self.vision_bounds is not None:
+            self.vision_surface.fill(0, self.vision_bounds)
 
-        # 2️⃣ Reset vision mask
-        self.vision_surface.fill((0, 0, 0, 0))
+        # 2️⃣ Grain scrolls 1 screen px per frame, wrapping every tile (held still on low quality)
+        if self.animate_grain:
+            self.grain_offset = (self.grain_offset + 1) % GRAIN_TILE_SIZE
 
-        # 3️⃣ Player personal visibility (never disappears)
-        pygame.draw.circle(
+        # 3️⃣ Level lights, dimmest first so where they overlap the brighter one wins
+        lights_rect = self.draw_level_lights(platforms, current_mask, camera_offset)
+
+        # 4️⃣ Player personal visibility (never disappears)
+        spot_rect = pygame.draw.circle(
             self.vision_surface,
-            (255, 255, 255, 255),
-            screen_origin,
-            28
+            (255, 255, 255),
+            buffer_origin,
+            max(1, round(28 * s))
         )
 
-        # 4️⃣ Vision cone (focus affects RANGE only)
+        # 5️⃣ Vision cone (focus affects RANGE only)
         effective_radius = int(cone_radius * max(0.15, focus_ratio))
 
         poly = self.get_vision_polygon(
@@ -111,23 +421,86 @@ class LightSystem:
             platforms,
             current_mask
         )
+        if s != 1:
+            poly = [(x * s, y * s) for x, y in poly]
 
-        pygame.draw.polygon(
+        cone_rect = pygame.draw.polygon(
             self.vision_surface,
-            (255, 255, 255, 255),
+            (255, 255, 255),
             poly
         )
 
-        # 5️⃣ Cut vision out of darkness
-        self.dark_surface.blit(
-            self.vision_surface,
-            (0, 0),
-            special_flags=pygame.BLEND_RGBA_SUB
-        )
+        # Remember what was drawn so lit queries and the next frame touch just that area
+        bounds = cone_rect.union(spot_rect)
+        if lights_rect is not None:
+            bounds.union_ip(lights_rect)
+        self.vision_bounds = bounds.clip(self.vision_surface.get_rect())
+        self.camera_offset = (int(camera_offset[0]), int(camera_offset[1]))
+        self.light_mask_dirty = True
+
+        # 6️⃣ Back to plain darkness, only where the vision was last frame or is now
+        if self.dirty_rect is None:
+            restore = self.dark_surface.get_rect()
+        else:
+            restore = self.dirty_rect.union(self.vision_bounds)
+        self.dark_surface.fill((*AMBIENT_DARK, 255), restore)
 
-        # 6️⃣ Animated void grain (darkness only)
-        self.grain_offset = (self.grain_offset + 1) % self.width
-        self.dark_surface.blit(self.grain_surface, (-self.grain_offset, 0))
-        self.dark_surface.blit(self.grain_surface, (self.width - self.grain_offset, 0))
+        # 7️⃣ Cut vision (player and level lights in one pass) out of darkness,
+        # inside the vision bounds only: alpha is all that changes
+        cut = self.vision_bounds
+        if cut.width and cut.height:
+            vision = pygame.surfarray.pixels2d(self.vision_surface)[cut.left:cut.right, cut.top:cut.bottom]
+            alpha = pygame.surfarray.pixels_alpha(self.dark_surface)
+            alpha[cut.left:cut.right, cut.top:cut.bottom] = 255 - vision
+            del alpha, vision  # unlock both surfaces
+
+        self.dirty_rect = cut
+
+        # 8️⃣ Low-res buffer + grain → screen size
+        if self.output_surface is not None:
+            # A straight pixel copy: a blit would alpha-blend the two buffers
+            src = pygame.surfarray.pixels2d(self.dark_surface)
+            dst = pygame.surfarray.pixels2d(self.overlay_surface)
+            dst[:] = src
+            del src, dst  # unlock both surfaces
+            self.overlay_surface.blit(self.grain_strip, (0, 0), self.grain_area())
+            upscale = pygame.transform.smoothscale if self.smooth_upscale else pygame.transform.scale
+            upscale(self.overlay_surface, (self.width, self.height), self.output_surface)
+            return self.output_surface
 
         return self.dark_surface
+
+    def grain_area(self):
+        """Visible part of grain_strip at the current scroll offset."""
+        w, h = self.dark_surface.get_size()
+        return (int(self.grain_offset * self.scale), 0, w, h)
+
+    def draw_grain(self, surface):
+        """Blit after draw_light's overlay; reduced tiers already have the grain in it."""
+        if self.output_surface is None:
+            surface.blit(self.grain_strip, (0, 0), self.grain_area())
+
+    # ---------------- LIT QUERIES ----------------
+    def _current_light_mask(self):
+        if self.light_mask_dirty:
+            self.light_mask.from_surface(
+                self.vision_surface, self.vision_bounds, self.camera_offset, scale=self.scale
+            )
+            self.light_mask_dirty = False
+        return self.light_mask
+
+    def is_point_lit(self, point):
+        """True if the WORLD point was inside the vision drawn last frame."""
+        return self._current_light_mask().is_point_lit(point)
+
+    def is_rect_lit(self, rect):
+        """True if any part of the WORLD rect was inside the vision drawn last frame."""
+        return self._current_light_mask().is_rect_lit(rect)
+
+    def lit_points(self, points):
+        """is_point_lit for many WORLD points in one call: bool array, one per point."""
+        return self._current_light_mask().lit_points(points)
+
+    def lit_rects(self, rects):
+        """is_rect_lit for many WORLD rects in one call: bool array, one per rect."""
+        return self._current_light_mask().lit_rects(rects)
@@ -1,4 +1,6 @@
 # main.py
+import logging
+import os
 import pygame
 import sys
 from settings import *
@@ -7,25 +9,53 @@ from platform import Platform, HookPlatform
 from light_system import LightSystem
 from ui import draw_hud
 from level_handler import LevelHandler
+from quality_governor import QualityGovernor
+from world_layer import WorldLayerCache
+from asset_cache import AssetCache
 
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
 pygame.init()
 
 screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED | pygame.FULLSCREEN)
 clock = pygame.time.Clock()
+assets = AssetCache(ASSET_CACHE_BUDGET)
+asset_pack_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ASSET_PACK_PATH)
+assets.open_pack(asset_pack_path)
 
 # ---------------- PLAYER ----------------
-player_img = pygame.image.load("Charlotte\PlayerSprites\PlayerIdleNoMask.png").convert_alpha()
-player_img = pygame.transform.scale(player_img, (CUBE_SIZE, CUBE_SIZE))
+player_img = assets.acquire("Charlotte\PlayerSprites\PlayerIdleNoMask.png", (CUBE_SIZE, CUBE_SIZE))
 player = Player((150, 550, CUBE_SIZE, CUBE_SIZE), player_img)
 player.current_mask = 1
 player.health = player.max_health
 
+torch_img = assets.acquire("Charlotte\BackgroundAssets\FrontTorch.png")
+
 # ---------------- LEVEL HANDLER ----------------
 level_handler = LevelHandler(WIDTH, HEIGHT)
 platforms, exit_rect = level_handler.load_level(0)
 
+# ---------------- WORLD LAYER ----------------
+def render_world(surface, mask):
+    """Static platforms of one mask on black, for WorldLayerCache."""
+    surface.fill((0, 0, 0))
+    for p in level_handler.active_platforms(mask):
+        p.draw(surface, mask)
+
+world_layers = WorldLayerCache((WIDTH, HEIGHT), render_world)
+world_layers.prerender(MASK_INFO)
+
 # ---------------- LIGHT SYSTEM ----------------
 light_system = LightSystem(WIDTH, HEIGHT)
+light_system.set_occluder_index(level_handler.mask_index)
+light_system.set_lights(level_handler.lights)
+
+# ---------------- QUALITY GOVERNOR ----------------
+governor = QualityGovernor(light_system) if QUALITY_GOVERNOR else None
+show_overlay = DEBUG_OVERLAY
+overlay_font = pygame.font.SysFont("Courier", 16, bold=True)
+
+# Everything above has been loaded: write the pack if any of it was not in it
+assets.save_pack(asset_pack_path)
 
 # ---------------- TRANSITION ----------------
 transition_active = False
@@ -43,6 +73,9 @@ def draw_exit_transition(surface, progress):
 running = True
 while running:
     dt = clock.tick(FPS) / 1000
+    if governor is not None:
+        # Work time only: the sleep inside tick would hide any headroom
+        governor.update(clock.get_rawtime())
     keys = pygame.key.get_pressed()
     holding_shift = keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
     t = pygame.time.get_ticks() * 0.001  # for HUD animation
@@ -54,6 +87,8 @@ while running:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 running = False
+            if event.key == pygame.K_F3:
+                show_overlay = not show_overlay
 
             # ---- MASK SWITCHING ----
             if event.key == pygame.K_1:
@@ -82,7 +117,7 @@ while running:
 
     # ---------------- PLAYER UPDATE ----------------
     if not transition_active:
-        player.update(dt, platforms, keys, holding_shift)
+        player.update(dt, level_handler.platform_grid, keys, holding_shift)
 
     # ---------------- CHECK EXIT ----------------
     if not transition_active and level_handler.is_player_at_exit(player.rect):
@@ -90,9 +125,9 @@ while running:
         transition_progress = 0.0
 
     # ---------------- DRAW WORLD ----------------
-    screen.fill((0, 0, 0))
-    for p in platforms:
-        p.draw(screen, player.current_mask)
+    screen.blit(world_layers.get(player.current_mask), (0, 0))
+    for light in level_handler.lights:
+        screen.blit(torch_img, torch_img.get_rect(center=light.pos))
     player.draw(screen)
 
     # ---------------- LIGHT ----------------
@@ -110,9 +145,12 @@ while running:
         cone_radius=player.current_cone_radius
     )
     screen.blit(light_surface, (0, 0))
+    light_system.draw_grain(screen)
 
     # ---------------- HUD ----------------
     draw_hud(screen, player, t)
+    if show_overlay and governor is not None:
+        governor.draw_overlay(screen, overlay_font, (20, HEIGHT - 30))
 
     # ---------------- TRANSITION EFFECT ----------------
     if transition_active:
@@ -124,6 +162,10 @@ while running:
             result = level_handler.next_level()
             if result:
                 platforms, exit_rect = result
+                light_system.set_occluder_index(level_handler.mask_index)
+                light_system.set_lights(level_handler.lights)
+                world_layers.invalidate()
+                world_layers.prerender(MASK_INFO)
                 player.rect.topleft = (150, 550)
                 transition_active = False
             else:
@@ -2,6 +2,9 @@
 import pygame
 from settings import MASK_INFO
 
+# Slightly brighter than the mask color for visibility
+PLATFORM_COLORS = {mask: tuple(min(255, c + 20) for c in info["color"]) for mask, info in MASK_INFO.items()}
+
 class Platform:
     """Basic platform with optional mask visibility."""
     def __init__(self, rect, visible_masks=None):
@@ -16,9 +19,7 @@ class Platform:
         """Draw the platform if visible."""
         if not self.visible(current_mask):
             return
-        base_color = MASK_INFO[current_mask]["color"]
-        # Slightly brighter for visibility
-        color = tuple(min(255, c + 20) for c in base_color)
+        color = PLATFORM_COLORS[current_mask]
 
         if camera:
             rect = camera.apply(self.rect)
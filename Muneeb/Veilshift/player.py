@@ -2,6 +2,10 @@
 import pygame
 import math
 import settings as s
+from sprite_variants import SpriteVariants
+
+# Squashed / flipped player frames, shared by every Player
+variants = SpriteVariants(s.SPRITE_VARIANT_CACHE_SIZE, s.SPRITE_ALPHA_LEVELS)
 
 class Player:
     def __init__(self, rect, img):
@@ -114,9 +118,10 @@ class Player:
         return self.focus / s.FOCUS_MAX
 
     # ---------------- PHYSICS ----------------
-    def move_and_collide(self, platforms):
+    def move_and_collide(self, platform_grid):
+        """platform_grid: SpatialHash of platforms; only the ones touching the player are tested."""
         self.rect.x += int(self.vel_x)
-        for p in platforms:
+        for p in platform_grid.query_rect(self.rect):
             if self.rect.colliderect(p.rect):
                 if self.vel_x > 0:
                     self.rect.right = p.rect.left
@@ -128,7 +133,7 @@ class Player:
         self.rect.y += int(self.vel_y)
 
         self.on_ground = False
-        for p in platforms:
+        for p in platform_grid.query_rect(self.rect):
             if self.rect.colliderect(p.rect):
                 if self.vel_y > 0:
                     self.rect.bottom = p.rect.top
@@ -162,8 +167,8 @@ class Player:
 
         h_scale = self.current_scale_x
         v_scale = 1 - 0.05 * abs(self.vel_x) / s.SPEED
-        scaled_img = pygame.transform.scale(self.img, (int(s.CUBE_SIZE * abs(h_scale)), int(s.CUBE_SIZE * v_scale)))
-        if h_scale < 0: scaled_img = pygame.transform.flip(scaled_img, True, False)
+        scaled_img = variants.get(self.img, flip_x=h_scale < 0,
+                                  size=(s.CUBE_SIZE * abs(h_scale), s.CUBE_SIZE * v_scale))
 
         surface.blit(scaled_img, (self.rect.topleft[0], self.rect.topleft[1] + self.bob_offset))
 
@@ -173,13 +178,13 @@ class Player:
         self.current_scale_x += (target_scale_x - self.current_scale_x) * 0.2
 
     # ---------------- UPDATE ALL ----------------
-    def update(self, dt, platforms, keys, holding_shift):
+    def update(self, dt, platform_grid, keys, holding_shift):
         self.handle_input(keys, dt)
         self.update_focus(dt, holding_shift)
 
         if self.grapple_active:
             self.update_grapple(dt)
         else:
-            self.move_and_collide(platforms)
+            self.move_and_collide(platform_grid)
 
         self.update_flip()
\ No newline at end of file
@@ -0,0 +1,83 @@
+# quality_governor.py
+import logging
+from collections import deque
+from settings import (FPS, QUALITY_PRESETS, GOVERNOR_WINDOW, GOVERNOR_DOWN_LOAD,
+                      GOVERNOR_UP_LOAD, GOVERNOR_UP_DELAY, GOVERNOR_MAX_UP_DELAY)
+
+log = logging.getLogger(__name__)
+
+# QUALITY_PRESETS is ordered cheapest first
+TIERS = tuple(QUALITY_PRESETS)
+
+
+class QualityGovernor:
+    """
+    Holds the frame rate by stepping the LightSystem between QUALITY_PRESETS
+    tiers at runtime.
+
+    Feed it the work time of every frame (clock.get_rawtime(), which leaves
+    out the sleep in clock.tick, so headroom shows up too). Once a full
+    window of frames has been seen:
+    - average load above GOVERNOR_DOWN_LOAD of the 1/FPS budget: one tier down
+    - below GOVERNOR_UP_LOAD for GOVERNOR_UP_DELAY seconds: one tier up
+
+    The gap between the two loads plus the delay is the hysteresis. A tier
+    that has to be left again right after stepping up to it doubles the
+    delay before the next try, so a machine sitting on the edge settles
+    instead of flipping every few seconds. The window restarts after every
+    switch so the rebuild frame never counts.
+    """
+    def __init__(self, light_system, target_fps=FPS):
+        self.light_system = light_system
+        self.budget_ms = 1000 / target_fps
+        self.samples = deque(maxlen=GOVERNOR_WINDOW)
+        self.headroom_ms = 0.0     # time spent under GOVERNOR_UP_LOAD since the last switch
+        self.up_delay = GOVERNOR_UP_DELAY
+        self.last_step_up = None   # tier we last stepped up to, until it holds for a window
+        self.load = 0.0            # last window's average share of the budget
+
+    @property
+    def tier(self):
+        return self.light_system.quality
+
+    def update(self, work_ms):
+        """Call once per frame with that frame's work time in ms."""
+        self.samples.append(work_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return
+        self.load = sum(self.samples) / len(self.samples) / self.budget_ms
+        index = TIERS.index(self.tier)
+
+        if self.load > GOVERNOR_DOWN_LOAD:
+            if index == 0:
+                return
+            if self.last_step_up == self.tier:
+                # Bounced straight back: wait longer before trying this tier again
+                self.up_delay = min(self.up_delay * 2, GOVERNOR_MAX_UP_DELAY)
+            self._switch(TIERS[index - 1])
+            return
+
+        # A full window at the new tier without stepping down: it holds
+        self.last_step_up = None
+
+        if self.load < GOVERNOR_UP_LOAD and index < len(TIERS) - 1:
+            # Wall time: clock.tick pads a light frame out to the budget
+            self.headroom_ms += max(work_ms, self.budget_ms)
+            if self.headroom_ms >= self.up_delay * 1000:
+                self._switch(TIERS[index + 1])
+                self.last_step_up = self.tier
+        else:
+            self.headroom_ms = 0.0
+
+    def _switch(self, tier):
+        log.info("quality %s -> %s (load %.0f%% of %.1f ms)", self.tier, tier, self.load * 100, self.budget_ms)
+        self.light_system.set_quality(tier)
+        self.samples.clear()
+        self.headroom_ms = 0.0
+
+    # ---------------- DEBUG OVERLAY ----------------
+    def draw_overlay(self, surface, font, pos):
+        """Current tier and average frame work time against the budget."""
+        avg = sum(self.samples) / len(self.samples) if self.samples else 0.0
+        text = f"quality {self.tier}  {avg:.1f} / {self.budget_ms:.1f} ms"
+        surface.blit(font.render(text, True, (200, 220, 255)), pos)
@@ -31,13 +31,54 @@ FOCUS_DEBOUNCE_TIME = 0.6
 FOCUS_ACTIVATE_THRESHOLD = 35.0
 FOCUS_SLOW_REGEN_THRESHOLD = 40.0
 
+# ---------------- QUALITY ----------------
+# light_scale: resolution of the darkness / vision buffers (1, 1/2, 1/4), upscaled on blit
+# smooth_upscale: smoothscale the buffer up, or plain nearest scale (several times cheaper)
+# ray_count / adaptive_ray_budget: rays per vision cone for the fan / adaptive engines
+# animate_grain: scroll the void grain; a still grain lets the darkness redraw only around the cone
+# Ordered cheapest first, the quality governor steps through them in this order
+QUALITY_PRESETS = {
+    "low":    {"light_scale": 0.25, "smooth_upscale": False, "ray_count": 24, "adaptive_ray_budget": 24, "animate_grain": False},
+    "medium": {"light_scale": 0.5,  "smooth_upscale": True,  "ray_count": 36, "adaptive_ray_budget": 40, "animate_grain": True},
+    "high":   {"light_scale": 1,    "smooth_upscale": True,  "ray_count": 50, "adaptive_ray_budget": 64, "animate_grain": True},
+}
+QUALITY = "high"
+
+# ---------------- QUALITY GOVERNOR ----------------
+QUALITY_GOVERNOR = True        # step QUALITY_PRESETS down / up at runtime to hold FPS
+GOVERNOR_WINDOW = 30           # frames averaged per decision
+GOVERNOR_DOWN_LOAD = 0.9       # step down when frames use more than this share of the 1/FPS budget
+GOVERNOR_UP_LOAD = 0.55        # step up when they use less than this...
+GOVERNOR_UP_DELAY = 2.0        # ...for this many seconds; doubles each time a step up bounces
+GOVERNOR_MAX_UP_DELAY = 60.0
+DEBUG_OVERLAY = False          # quality tier + frame time in the corner, toggled with F3
+
 # ---------------- LIGHT ----------------
 BASE_RADIUS = 30
 BASE_CONE_RADIUS = 140
 MAX_CONE_RADIUS = 300
 FOV_ANGLE = 90
-RAY_COUNT = 50
-RAY_STEP = 4
+LIGHT_ENGINE = "rays"      # "rays" = uniform ray fan, "sweep" = exact corner sweep, "dda" = fan over occupancy grid,
+                           # "adaptive" = coarse fan refined at shadow edges
+SWEEP_ARC_TOLERANCE = 0.5  # max px the sweep polygon may cut inside the cone arc
+DDA_CELL_SIZE = 16         # px per occupancy cell for the "dda" engine
+DDA_REFINE = True          # refine DDA hits to the exact platform edge
+RAY_REUSE_DISTANCE = 0.5   # px the light may drift before every cached ray is recast (< 1 = only while still)
+RAY_REUSE_ANGLE = 0.01     # deg; a ray this close to a cached ray's angle reuses its hit
+ADAPTIVE_BASE_RAYS = 16    # coarse fan the "adaptive" engine starts from
+ADAPTIVE_ANGLE_TOLERANCE = 0.1  # deg; stop bisecting a shadow edge below this gap
+GRAIN_TILE_SIZE = 256      # screen px of the seamless void grain tile (multiple of 8)
+GRAIN_SEED = 1             # same grain every run
+DEMO_LIGHTS = False        # add the example torches (LevelHandler demo table) to levels 0 and 1
+
+# ---------------- SPATIAL HASH ----------------
+GRID_CELL_SIZE = 128  # px per spatial hash cell (collision, light culling, scans)
+
+# ---------------- ASSETS ----------------
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024  # bytes of unreferenced decoded images kept around
+SPRITE_VARIANT_CACHE_SIZE = 256        # flipped / squashed / faded sprite copies kept (LRU)
+SPRITE_ALPHA_LEVELS = 16               # fades snap to this many alpha steps
+ASSET_PACK_PATH = "pack_cache/assets.pack"  # pre-decoded images mapped at startup, next to main.py
 
 # ---------------- GRAPPLE ----------------
 GRAPPLE_MAX_RANGE = 300
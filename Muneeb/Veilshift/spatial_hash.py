@@ -0,0 +1,127 @@
+# spatial_hash.py
+import math
+import pygame
+
+
+class SpatialHash:
+    """
+    Uniform grid bucketing items by the cells their rect covers.
+
+    Items spanning more than max_span cells along either axis (e.g. the
+    20000 px side walls) are not bucketed; they sit in a short "oversized"
+    list that every query tests directly, so one giant rect never floods
+    hundreds of buckets.
+
+    Queries return matching items in insertion order, without duplicates.
+    """
+    def __init__(self, cell_size, max_span=64):
+        self.cell_size = cell_size
+        self.max_span = max_span
+        self.cells = {}
+        self.oversized = []  # (order, item, rect)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        x0 = math.floor(rect.left / cs)
+        y0 = math.floor(rect.top / cs)
+        x1 = math.floor((rect.right - 1) / cs) if rect.width > 0 else x0
+        y1 = math.floor((rect.bottom - 1) / cs) if rect.height > 0 else y0
+        return x0, y0, x1, y1
+
+    # ---------------- BUILD ----------------
+    def insert(self, item, rect):
+        rect = pygame.Rect(rect)
+        rect.normalize()
+        entry = (self.count, item, rect)
+        self.count += 1
+
+        x0, y0, x1, y1 = self._cell_range(rect)
+        if x1 - x0 >= self.max_span or y1 - y0 >= self.max_span:
+            self.oversized.append(entry)
+            return
+
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(entry)
+
+    @classmethod
+    def from_items(cls, items, cell_size, key=lambda item: item.rect, max_span=64):
+        grid = cls(cell_size, max_span)
+        for item in items:
+            grid.insert(item, key(item))
+        return grid
+
+    # ---------------- QUERIES ----------------
+    def _collect(self, cells, accept):
+        found = {}
+        for cell in cells:
+            for order, item, rect in self.cells.get(cell, ()):
+                if order not in found and accept(rect):
+                    found[order] = item
+        for order, item, rect in self.oversized:
+            if order not in found and accept(rect):
+                found[order] = item
+        return [found[k] for k in sorted(found)]
+
+    def query_rect(self, rect):
+        """Items whose rect overlaps or touches rect."""
+        rect = pygame.Rect(rect)
+        rect.normalize()
+        # Grow by a pixel so items flush against the query (resting contact) come back too
+        probe = rect.inflate(2, 2)
+        x0, y0, x1, y1 = self._cell_range(probe)
+        cells = ((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+        return self._collect(cells, probe.colliderect)
+
+    def query_radius(self, center, radius):
+        """Items whose rect comes within radius of center."""
+        cx, cy = center
+        r2 = radius * radius
+
+        def accept(rect):
+            nx = min(max(cx, rect.left), rect.right)
+            ny = min(max(cy, rect.top), rect.bottom)
+            return (nx - cx) ** 2 + (ny - cy) ** 2 <= r2
+
+        box = pygame.Rect(math.floor(cx - radius), math.floor(cy - radius),
+                          math.ceil(2 * radius) + 1, math.ceil(2 * radius) + 1)
+        x0, y0, x1, y1 = self._cell_range(box)
+        cells = ((gx, gy) for gx in range(x0, x1 + 1) for gy in range(y0, y1 + 1))
+        return self._collect(cells, accept)
+
+    def query_segment(self, start, end):
+        """
+        Items in the cells the segment start -> end passes through. Cells are
+        walked with a grid traversal, so cost follows the segment's length,
+        not the level's size. Callers do the exact segment test.
+        """
+        return self._collect(self._segment_cells(start, end), lambda rect: True)
+
+    def _segment_cells(self, start, end):
+        cs = self.cell_size
+        x, y = start
+        ex, ey = end
+        cx, cy = math.floor(x / cs), math.floor(y / cs)
+        end_cx, end_cy = math.floor(ex / cs), math.floor(ey / cs)
+        dx, dy = ex - x, ey - y
+
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        t_delta_x = abs(cs / dx) if dx else math.inf
+        t_delta_y = abs(cs / dy) if dy else math.inf
+        t_max_x = ((cx + (step_x > 0)) * cs - x) / dx if dx else math.inf
+        t_max_y = ((cy + (step_y > 0)) * cs - y) / dy if dy else math.inf
+
+        yield (cx, cy)
+        for _ in range(abs(end_cx - cx) + abs(end_cy - cy)):
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+            yield (cx, cy)
@@ -0,0 +1,54 @@
+# sprite_variants.py
+from collections import OrderedDict
+import pygame
+
+
+class SpriteVariants:
+    """
+    Flipped / resized / faded copies of sprites, built the first time they
+    are drawn and then reused, so draw code only blits.
+
+    Keys are (sprite, flip_x, size, alpha). Sizes are whole pixels and alpha
+    snaps to alpha_levels steps, so a squash animation or a death fade
+    cycles through a small set of cached surfaces instead of allocating a
+    new one every frame. The least recently used variants are dropped past
+    max_entries.
+
+    Returned surfaces are shared: never draw on them or change their alpha.
+    """
+    def __init__(self, max_entries=256, alpha_levels=16):
+        self.max_entries = max_entries
+        self.alpha_step = 255 / (alpha_levels - 1)
+        self.variants = OrderedDict()
+
+    def get(self, sprite, flip_x=False, size=None, alpha=255):
+        """sprite scaled to size (None = as is), then mirrored if flip_x, then faded to alpha."""
+        if size is not None:
+            size = (max(0, int(size[0])), max(0, int(size[1])))
+            if size == sprite.get_size():
+                size = None
+        alpha = round(round(alpha / self.alpha_step) * self.alpha_step)
+        if size is None and not flip_x and alpha >= 255:
+            return sprite
+
+        key = (sprite, flip_x, size, alpha)
+        variant = self.variants.get(key)
+        if variant is not None:
+            self.variants.move_to_end(key)
+            return variant
+
+        variant = sprite if size is None else pygame.transform.scale(sprite, size)
+        if flip_x:
+            variant = pygame.transform.flip(variant, True, False)
+        if alpha < 255:
+            if variant is sprite:
+                variant = sprite.copy()
+            variant.set_alpha(alpha)
+
+        self.variants[key] = variant
+        if len(self.variants) > self.max_entries:
+            self.variants.popitem(last=False)
+        return variant
+
+    def clear(self):
+        self.variants.clear()
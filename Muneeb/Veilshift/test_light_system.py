@@ -0,0 +1,54 @@
+# test_light_system.py
+from types import SimpleNamespace
+import numpy as np
+import pygame
+from light_system import LightSystem
+from mask_layer import MaskLayer
+from settings import GRID_CELL_SIZE
+
+pygame.init()
+
+# The wall only comes within RADIUS of the light on the right of x = 28,
+# and it is listed first, so it shifts the floor's row in a culled subset
+WALL = pygame.Rect(GRID_CELL_SIZE, 290, 10, 20)
+FLOOR = pygame.Rect(0, 350, 400, 20)
+RADIUS = 100
+ANGLES = np.linspace(70, 110, 9)
+
+
+def light_over(*rects):
+    light = LightSystem(64, 64)
+    layer = MaskLayer([SimpleNamespace(rect=r) for r in rects], GRID_CELL_SIZE)
+    light.set_occluder_index({0: layer})
+    return light, layer
+
+
+def assert_ids_name_hit_rects(layer, points, hit_ids):
+    for (x, y), row in zip(points, hit_ids):
+        assert row >= 0
+        left, top, right, bottom = layer.rects[row]
+        assert left - 1e-6 <= x <= right + 1e-6 and top - 1e-6 <= y <= bottom + 1e-6
+
+
+def test_hit_ids_are_layer_rows_across_a_cell():
+    light, layer = light_over(WALL, FLOOR)
+    floor_row = 1
+
+    # The wall is out of reach on the left of the cell boundary, in reach on the right
+    for origin in ((20, 300), (GRID_CELL_SIZE + 60, 300)):
+        points, _, hit_ids = light.cast_angles(origin, ANGLES, RADIUS, [], 0)
+        assert_ids_name_hit_rects(layer, points, hit_ids)
+        assert (hit_ids == floor_row).all()
+
+
+def test_reused_rays_keep_layer_rows():
+    light, layer = light_over(WALL, FLOOR)
+
+    # Nudge the light (within RAY_REUSE_DISTANCE) until the wall is culled in
+    light.cast_coherent((27.8, 300), ANGLES, RADIUS, [], 0)
+    light.invalidate_rays(pygame.Rect(0, 345, 28, 10))  # the left half of the fan is recast
+    points, _, hit_ids = light.cast_coherent((28.2, 300), ANGLES, RADIUS, [], 0)
+
+    assert light.ray_stats["reused"] > 0
+    assert_ids_name_hit_rects(layer, points, hit_ids)
+    assert len(set(hit_ids.tolist())) == 1
@@ -0,0 +1,38 @@
+# world_layer.py
+import pygame
+
+
+class WorldLayerCache:
+    """
+    Pre-rendered static world (background + platforms), one opaque surface
+    per key, so a frame costs one blit instead of a draw call per platform.
+
+    render(surface, key) paints the layer for key (typically the mask) and
+    is only called the first time a key is drawn after a level load or an
+    invalidate(). Anything that moves, appears or recolours static geometry
+    must call invalidate(); invalidate(key) drops just that layer.
+    """
+    def __init__(self, size, render):
+        self.size = size
+        self.render = render
+        self.layers = {}
+
+    def get(self, key):
+        layer = self.layers.get(key)
+        if layer is None:
+            # Plain display-format surface: the cheapest thing to blit
+            layer = pygame.Surface(self.size).convert()
+            self.render(layer, key)
+            self.layers[key] = layer
+        return layer
+
+    def prerender(self, keys):
+        """Build the layers for keys now, e.g. every mask while a level loads."""
+        for key in keys:
+            self.get(key)
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.layers.clear()
+        else:
+            self.layers.pop(key, None)
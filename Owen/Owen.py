@@ -3,6 +3,8 @@ import sys
 import math
 import random 
 from credits import EndCredits
+from asset_loader import AssetLoader
+from raycast import cast_rays, fan_angles, rects_to_array, to_point_list
 
 pygame.init()
 
@@ -31,6 +33,9 @@ home_screen_img = pygame.image.load(
     r"Q:\Global game Jam\Veilshift\Charlotte\HomeScreen.png"
 ).convert_alpha()
 home_screen_img = pygame.transform.scale(home_screen_img, (WIDTH, HEIGHT))
+# Up before anything else loads, the rest streams in behind it (ASYNC LOADING)
+screen.blit(home_screen_img, (0, 0))
+pygame.display.flip()
 
 
 def get_mask_color():
@@ -53,68 +58,74 @@ player = pygame.Rect(150, 550, CUBE_SIZE, CUBE_SIZE)
 
 # ---------------- PLAYER SPRITES ----------------
 
-PLAYER_SPRITES = {
+PLAYER_SPRITE_PATHS = {
     MASKLESS: {
-        "idle": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerIdleNoMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
-        "run": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerRunningNoMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
+        "idle": "Charlotte\PlayerSprites\PlayerIdleNoMask.png",
+        "run": "Charlotte\PlayerSprites\PlayerRunningNoMask.png",
     },
 
     0: {  # Spectral mask
-        "idle": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerIdlePlatformMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
-        "run": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerRunningPlatformMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
+        "idle": "Charlotte\PlayerSprites\PlayerIdlePlatformMask.png",
+        "run": "Charlotte\PlayerSprites\PlayerRunningPlatformMask.png",
     },
 
     1: {  # Physical mask
-        "idle": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerIdleAttackMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
-        "run": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerRunningAttackMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
+        "idle": "Charlotte\PlayerSprites\PlayerIdleAttackMask.png",
+        "run": "Charlotte\PlayerSprites\PlayerRunningAttackMask.png",
     },
 
     2: {  # Puzzle mask
-        "idle": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerIdlePuzzleMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
-        "run": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerRunningPuzzleMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
+        "idle": "Charlotte\PlayerSprites\PlayerIdlePuzzleMask.png",
+        "run": "Charlotte\PlayerSprites\PlayerRunningPuzzleMask.png",
     },
 }
 
+ENEMY_IMAGE = "Charlotte\ShadowMonster.png"
+
+# ---------------- ASYNC LOADING ----------------
+# Sprites decode on a background thread while the home screen is up
+loader = AssetLoader()
+for paths in PLAYER_SPRITE_PATHS.values():
+    for path in paths.values():
+        loader.queue(path, (CUBE_SIZE, CUBE_SIZE))
+loader.queue(ENEMY_IMAGE, (CUBE_SIZE, CUBE_SIZE))
+loader.start()
+
+LOADING_BAR_HEIGHT = 6
+
+# --- HOME SCREEN ---
+start_requested = False
+waiting_for_input = True
+while waiting_for_input:
+    clock.tick(FPS)  # also leaves the loader thread the GIL between frames
+    loader.pump()
+    screen.fill((0, 0, 0))  # Optional: black background
+    screen.blit(home_screen_img, (0, 0))
+    if not loader.done:
+        bar_width = int(WIDTH * loader.progress())
+        pygame.draw.rect(screen, (255, 255, 255), (0, HEIGHT - LOADING_BAR_HEIGHT, bar_width, LOADING_BAR_HEIGHT))
+    pygame.display.flip()
+
+    for e in pygame.event.get():
+        if e.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        if e.type == pygame.KEYDOWN:
+            if e.key == pygame.K_RETURN:  # Press Enter to start
+                start_requested = True
+            if e.key == pygame.K_ESCAPE:  # Optional: Escape to quit
+                pygame.quit()
+                sys.exit()
+
+    # Enter before loading is done starts the game as soon as it is
+    if start_requested and loader.done:
+        waiting_for_input = False
+
+PLAYER_SPRITES = {
+    mask: {state: loader.wait(path, (CUBE_SIZE, CUBE_SIZE)) for state, path in paths.items()}
+    for mask, paths in PLAYER_SPRITE_PATHS.items()
+}
+
 vel_x = 0
 vel_y = 0
 SPEED = 6
@@ -136,9 +147,7 @@ MAX_PULSE_RADIUS = 20
 PULSE_SPEED = 0.0
 
 # Enemy image
-enemy1_img = pygame.image.load("Charlotte\ShadowMonster.png"
-).convert_alpha()
-enemy1_img = pygame.transform.scale(enemy1_img, (CUBE_SIZE, CUBE_SIZE))
+enemy1_img = loader.wait(ENEMY_IMAGE, (CUBE_SIZE, CUBE_SIZE))
 
 # ---------------- MASK ----------------
 current_mask = MASKLESS
@@ -164,12 +173,14 @@ class Platform:
         self.rect = pygame.Rect(rect)
         self.masks = masks  # None = always visible
 
-    def active(self):
-        if current_mask == MASKLESS:
+    def active(self, mask=None):
+        if mask is None:
+            mask = current_mask
+        if mask == MASKLESS:
             return self.masks is None  # only walls & floor
         if self.masks is None:
             return True
-        return current_mask in self.masks
+        return mask in self.masks
 
     def draw(self):
         if not self.active():
@@ -324,7 +335,25 @@ def load_level():
         Platform((120, 280, 160, 25), [0]),
     ]
 
+def build_mask_index(level_platforms):
+    """
+    Freeze, per mask, which platforms are active and their rect array,
+    so rays and drawing read a ready-made set and a mask switch is a lookup.
+    """
+    index = {}
+    for mask in (MASKLESS, *MASK_INFO):
+        active = tuple(p for p in level_platforms if p.active(mask))
+        rects = rects_to_array([p.rect for p in active])
+        rects.setflags(write=False)
+        index[mask] = (active, rects)
+    return index
+
 platforms = load_level()
+mask_index = build_mask_index(platforms)
+
+def active_platforms():
+    """Platforms that exist under the current mask."""
+    return mask_index[current_mask][0]
 
 # ---------------- COLLISION ----------------
 def move_and_collide(rect, dx, dy):
@@ -359,60 +388,37 @@ FOV_ANGLE = 90
 light_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
 
 RAY_COUNT = 50
-RAY_STEP = 4
-
-
-def cast_ray(origin, angle):
-    ox, oy = origin
-    rad = math.radians(angle)
-    dx = math.cos(rad)
-    dy = math.sin(rad)
-
-    for i in range(0, LIGHT_RADIUS, RAY_STEP):
-        px = ox + dx * i
-        py = oy + dy * i
-        for p in platforms:
-            if p.active() and p.rect.collidepoint(px, py):
-                return (px, py)
-
-    return (ox + dx * LIGHT_RADIUS, oy + dy * LIGHT_RADIUS)
 
-def cast_ray_enemy(origin, angle):
-    ox, oy = origin
-    rad = math.radians(angle)
-    dx = math.cos(rad)
-    dy = math.sin(rad)
+# The cone gradient is radially symmetric, so it is drawn once, centred on
+# the light, and never rotated
+def build_cone_gradient():
+    gradient = pygame.Surface((LIGHT_RADIUS*2, LIGHT_RADIUS*2), pygame.SRCALPHA)
+    center = LIGHT_RADIUS
+    for r in range(LIGHT_RADIUS, 0, -1):
+        alpha = int(200 * (r / LIGHT_RADIUS))
+        pygame.draw.circle(gradient, (255, 255, 220, alpha), (center, center), r)
+    return gradient
 
-    for i in range(0, ENEMY_VISION_RADIUS, RAY_STEP):
-        px = ox + dx * i
-        py = oy + dy * i
+cone_gradient = build_cone_gradient()
 
-        for p in platforms:
-            if p.active() and p.rect.collidepoint(px, py):
-                return (px, py)
 
-    return (ox + dx * ENEMY_VISION_RADIUS, oy + dy * ENEMY_VISION_RADIUS)
+def active_rects():
+    """Rect array of the platforms that block rays under the current mask."""
+    return mask_index[current_mask][1]
 
 def get_vision_polygon(origin):
-    points = [origin]
-    start = facing_angle - FOV_ANGLE / 2
-    step = FOV_ANGLE / RAY_COUNT
-    for i in range(RAY_COUNT + 1):
-        points.append(cast_ray(origin, start + i * step))
-    return points
+    angles = fan_angles(facing_angle - FOV_ANGLE / 2, FOV_ANGLE, RAY_COUNT)
+    points, _, _ = cast_rays(origin, angles, active_rects(), LIGHT_RADIUS)
+    return to_point_list(origin, points)
 
 def get_enemy_vision_polygon(enemy):
     origin = enemy.rect.center
-    points = [origin]
-
     start_angle = -ENEMY_FOV / 2 if enemy.facing_right else 180 - ENEMY_FOV / 2
 
-    for i in range(int(ENEMY_FOV) + 1):
-        angle = start_angle + i
-        end_point = cast_ray_enemy(origin, angle)
-        points.append(end_point)
-
-    return points
+    # one ray per degree, all cast in a single batch
+    angles = fan_angles(start_angle, int(ENEMY_FOV), int(ENEMY_FOV))
+    points, _, _ = cast_rays(origin, angles, active_rects(), ENEMY_VISION_RADIUS)
+    return to_point_list(origin, points)
 
 def point_in_polygon(point, poly):
     x, y = point
@@ -439,27 +445,23 @@ def draw_light(origin):
     )
     mini_spot = pygame.Surface((pulse_radius*2, pulse_radius*2), pygame.SRCALPHA)
     pygame.draw.circle(mini_spot, (255, 255, 200, 100), (pulse_radius, pulse_radius), int(pulse_radius))
-    light_surface.blit(mini_spot, (origin[0]-pulse_radius, origin[1]-pulse_radius), special_flags=pygame.BLEND_RGBA_ADD)
+    spot_rect = light_surface.blit(mini_spot, (origin[0]-pulse_radius, origin[1]-pulse_radius), special_flags=pygame.BLEND_RGBA_ADD)
 
     # --- Main cone light ---
     poly = get_vision_polygon(origin)
-    pygame.draw.polygon(light_surface, (255, 255, 180, 200), poly)
+    cone_rect = pygame.draw.polygon(light_surface, (255, 255, 180, 200), poly)
 
     # --- Cone gradient ---
-    gradient = pygame.Surface((LIGHT_RADIUS*2, LIGHT_RADIUS*2), pygame.SRCALPHA)
-    center = LIGHT_RADIUS
-    for r in range(LIGHT_RADIUS, 0, -1):
-        alpha = int(200 * (r / LIGHT_RADIUS))
-        pygame.draw.circle(gradient, (255, 255, 220, alpha), (center, center), r)
-    rot = pygame.transform.rotate(gradient, -facing_angle)
-    rect = rot.get_rect(center=origin)
-    light_surface.blit(rot, rect.topleft, special_flags=pygame.BLEND_RGBA_MULT)
+    # Clipped to what the cone and spot lit: everywhere else is black already
+    gradient_rect = cone_gradient.get_rect(center=origin)
+    clip = cone_rect.union(spot_rect).clip(gradient_rect)
+    light_surface.blit(cone_gradient, clip.topleft, clip.move(-gradient_rect.x, -gradient_rect.y),
+                       special_flags=pygame.BLEND_RGBA_MULT)
 
     # --- Draw light on screen ---
     screen.fill(AMBIENT_DARK)  # Base ambient dark
-    for p in platforms:
-        if p.active():  # only draw visible platforms
-            p.draw()
+    for p in active_platforms():  # only draw visible platforms
+        p.draw()
     screen.blit(light_surface, (0,0), special_flags=pygame.BLEND_RGBA_MULT)
 
 # ---------------- ENEMY ----------------
@@ -666,24 +668,6 @@ def is_in_light(obj_rect, player_center, player_angle):
     return point_in_cone(obj_rect.center, player_center, player_angle)
 
 
-# --- HOME SCREEN ---
-waiting_for_input = True
-while waiting_for_input:
-    screen.fill((0, 0, 0))  # Optional: black background
-    screen.blit(home_screen_img, (0, 0))
-    pygame.display.flip()
-
-    for e in pygame.event.get():
-        if e.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        if e.type == pygame.KEYDOWN:
-            if e.key == pygame.K_RETURN:  # Press Enter to start
-                waiting_for_input = False
-            if e.key == pygame.K_ESCAPE:  # Optional: Escape to quit
-                pygame.quit()
-                sys.exit()
-
 
 
 # -------- GAME LOOP --------
@@ -834,7 +818,7 @@ while running:
     # --- DRAW ---
     screen.fill(AMBIENT_DARK)
 
-    for p in platforms:
+    for p in active_platforms():
         p.draw()
 
     draw_light(player.center)
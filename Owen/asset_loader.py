@@ -0,0 +1,136 @@
+# asset_loader.py
+import queue
+import threading
+import pygame
+
+
+class AssetLoader:
+    """
+    Decodes and scales images on a background thread while the main thread
+    keeps drawing, e.g. behind the home screen. pygame releases the GIL
+    inside image.load and transform.scale, so the two really overlap.
+
+    queue() everything startup needs, start(), then pump() once a frame:
+    converting to display format has to happen on the main thread, so
+    finished images wait for it there. progress() is the share done;
+    wait() blocks until one image is ready and returns it. queue_task()
+    adds other startup work (e.g. a bake) to run on the thread after the
+    images; it counts towards progress() and done like one.
+
+    With an AssetCache, finished images go into the cache, images it can
+    already serve (decoded, or in its pack file) are not queued, and an
+    acquire() of a queued image waits for the thread instead of decoding
+    it a second time. Without one the loader keeps the surfaces itself.
+    """
+    def __init__(self, assets=None):
+        self.assets = assets
+        self.jobs = []                 # keys in load order
+        self.tasks = []                # callables run after the images
+        self.pending = set()           # keys and tasks queued, not yet finished
+        self.finished = queue.Queue()  # (key or task, image, error) from the thread, in load order
+        self.surfaces = {}             # key -> surface, without a cache
+        self.errors = {}               # key -> exception the thread hit
+        self.thread = None
+        if assets is not None:
+            assets.loader = self
+
+    def key(self, path, size=None, alpha=True):
+        if self.assets is not None:
+            return self.assets.key(path, size, alpha)
+        return path, None if size is None else (int(size[0]), int(size[1])), bool(alpha)
+
+    def queue(self, path, size=None, alpha=True):
+        """Add an image to load; call before start()."""
+        key = self.key(path, size, alpha)
+        if key in self.pending or key in self.surfaces:
+            return
+        if self.assets is not None and self.assets.can_serve(key):
+            return
+        self.jobs.append(key)
+        self.pending.add(key)
+
+    def queue_task(self, task):
+        """Run task() on the thread once the images are loaded; call before start()."""
+        self.tasks.append(task)
+        self.pending.add(task)
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, args=(list(self.jobs), list(self.tasks)),
+                                       name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def _run(self, jobs, tasks):
+        for key in jobs:
+            path, size, _ = key
+            try:
+                image = pygame.image.load(path)
+                if size is not None:
+                    image = pygame.transform.scale(image, size)
+            except (OSError, pygame.error) as e:
+                # Raised on the main thread by wait(); the cache just decodes it itself
+                self.finished.put((key, None, e))
+            else:
+                self.finished.put((key, image, None))
+        for task in tasks:
+            try:
+                task()
+            except Exception as e:
+                # Re-raised on the main thread by _finish
+                self.finished.put((task, None, e))
+            else:
+                self.finished.put((task, None, None))
+
+    # ---------------- MAIN THREAD ----------------
+    @property
+    def done(self):
+        return not self.pending
+
+    def progress(self):
+        """Share of the queued images and tasks that are done, 0.0 - 1.0."""
+        if not self.jobs and not self.tasks:
+            return 1.0
+        return 1 - len(self.pending) / (len(self.jobs) + len(self.tasks))
+
+    def pump(self):
+        """Convert whatever the thread has finished, without blocking. Returns done."""
+        while self.pending:
+            try:
+                self._finish(*self.finished.get_nowait())
+            except queue.Empty:
+                break
+        return self.done
+
+    def wait_for(self, key):
+        """Block until key, if it is queued, has been converted."""
+        while key in self.pending:
+            self._finish(*self.finished.get())
+
+    def wait(self, path, size=None, alpha=True):
+        """Block until the image is ready and return it (acquire()d, with a cache)."""
+        key = self.key(path, size, alpha)
+        self.wait_for(key)
+        if self.assets is not None:
+            return self.assets.acquire(path, size, alpha)
+        if key in self.errors:
+            raise self.errors[key]
+        if key not in self.surfaces:
+            # Never queued: load it here
+            image = pygame.image.load(path)
+            self._finish(key, image if size is None else pygame.transform.scale(image, key[1]), None)
+        return self.surfaces[key]
+
+    def wait_all(self):
+        while self.pending:
+            self._finish(*self.finished.get())
+
+    def _finish(self, key, image, error):
+        self.pending.discard(key)
+        if callable(key):
+            if error is not None:
+                raise error
+        elif error is not None:
+            self.errors[key] = error
+        elif self.assets is not None:
+            self.assets.put(key, image)
+        else:
+            self.surfaces[key] = image.convert_alpha() if key[2] else image.convert()
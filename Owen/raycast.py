@@ -0,0 +1,97 @@
+# raycast.py
+import numpy as np
+
+
+def rects_to_array(rects):
+    """
+    Pack rects into an (M, 4) float array of x0, y0, x1, y1 for cast_rays.
+    Empty or negative-size rects are dropped: like Rect.collidepoint, they
+    never stop a ray.
+    """
+    rows = [
+        (r[0], r[1], r[0] + r[2], r[1] + r[3])
+        for r in rects
+        if r[2] > 0 and r[3] > 0
+    ]
+    if not rows:
+        return np.empty((0, 4), dtype=float)
+    return np.array(rows, dtype=float)
+
+
+def _slab_axis(o, d, lo, hi):
+    """Entry/exit distances of rays against one pair of slab planes."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (lo - o) / d
+        t2 = (hi - o) / d
+    t_min = np.minimum(t1, t2)
+    t_max = np.maximum(t1, t2)
+
+    # Rays parallel to the slab either live inside it forever or never enter
+    parallel = d == 0
+    if parallel.any():
+        inside = (lo <= o) & (o <= hi)
+        t_min = np.where(parallel, np.where(inside, -np.inf, np.inf), t_min)
+        t_max = np.where(parallel, np.where(inside, np.inf, -np.inf), t_max)
+    return t_min, t_max
+
+
+def cast_rays(origin, angles, rects, max_dist):
+    """
+    Cast every ray in one vectorized slab-intersection pass.
+
+    origin: (x, y)
+    angles: sequence of ray angles in degrees
+    rects: (M, 4) array from rects_to_array
+    max_dist: ray length; rays that hit nothing stop here
+
+    Returns (points, dists, hit_ids):
+        points  (N, 2) end point of each ray
+        dists   (N,)   distance travelled
+        hit_ids (N,)   row of the rect that stopped the ray, -1 on a miss
+    A ray starting inside a rect hits it at distance 0.
+    """
+    ox, oy = origin
+    rad = np.radians(np.asarray(angles, dtype=float))
+    dx = np.cos(rad)
+    dy = np.sin(rad)
+    n = rad.shape[0]
+
+    if n == 0 or len(rects) == 0:
+        dists = np.full(n, float(max_dist))
+        hit_ids = np.full(n, -1, dtype=int)
+    else:
+        dx_col, dy_col = dx[:, None], dy[:, None]
+        tx_min, tx_max = _slab_axis(ox, dx_col, rects[None, :, 0], rects[None, :, 2])
+        ty_min, ty_max = _slab_axis(oy, dy_col, rects[None, :, 1], rects[None, :, 3])
+
+        t_near = np.maximum(tx_min, ty_min)
+        t_far = np.minimum(tx_max, ty_max)
+        hit = (t_near <= t_far) & (t_far >= 0)
+        t = np.where(hit, np.maximum(t_near, 0.0), np.inf)
+
+        nearest = np.argmin(t, axis=1)
+        t_hit = t[np.arange(n), nearest]
+        blocked = t_hit < max_dist
+        dists = np.where(blocked, t_hit, float(max_dist))
+        hit_ids = np.where(blocked, nearest, -1)
+
+    points = np.column_stack((ox + dx * dists, oy + dy * dists))
+    return points, dists, hit_ids
+
+
+def cast_ray(origin, angle, rects, max_dist):
+    """Single-ray convenience wrapper around cast_rays; returns (x, y)."""
+    points, _, _ = cast_rays(origin, (angle,), rects, max_dist)
+    return (float(points[0, 0]), float(points[0, 1]))
+
+
+def fan_angles(start_angle, spread, ray_count):
+    """ray_count + 1 evenly spaced angles covering [start, start + spread]."""
+    if ray_count <= 0:
+        return np.array([start_angle], dtype=float)
+    return start_angle + np.arange(ray_count + 1) * (spread / ray_count)
+
+
+def to_point_list(origin, points):
+    """[origin, (x, y), ...] polygon in the format pygame.draw.polygon takes."""
+    return [origin] + [(float(x), float(y)) for x, y in points]
@@ -0,0 +1,227 @@
+# asset_cache.py
+import hashlib
+import os
+from collections import OrderedDict
+import pygame
+from atlas import SpriteAtlas
+from asset_pack import AssetPack
+
+
+def normalize_path(path):
+    """One spelling per file, so "a\\b.png", "a/b.png" and "./a/b.png" share an entry."""
+    return os.path.normpath(str(path).replace("\\", "/"))
+
+
+class AssetCache:
+    """
+    Decoded images shared by everything that draws them, keyed by
+    (normalized path, size, alpha). Each PNG is decoded once; other sizes
+    are scaled from that decode.
+
+    acquire() hands out a shared surface and counts a reference; release()
+    drops it. Referenced surfaces are always kept. Unreferenced ones (and
+    the full-size decodes behind scaled copies) stay cached until the total
+    goes over budget_bytes, then the least recently used go first.
+
+    pack_atlas() moves a set of sprites into one SpriteAtlas page; acquire()
+    then hands out regions of it and never decodes those files, and
+    atlas_name() gives the region name to draw them by with SpriteAtlas.blits().
+
+    open_pack() / save_pack() keep every image the game asked for, already
+    scaled, in an AssetPack file that is memory-mapped on the next start.
+    An entry is ignored once its source file's size or mtime changes, and
+    the next save_pack() rewrites it.
+
+    An AssetLoader can decode into the cache on a background thread; a
+    _get() of an image still on its queue waits for it.
+
+    Surfaces are shared: copy() one before changing it (set_alpha, fill...).
+    """
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()  # key -> surface, least recently used first
+        self.entry_bytes = {}         # key -> bytes it owns (0 for atlas regions)
+        self.refs = {}                # key -> reference count
+        self.requested = set()        # keys acquired or preloaded: what save_pack writes
+        self.atlases = []
+        self.bytes = 0
+        self.decodes = 0    # PNGs read from disk so far
+        self.pack_hits = 0  # images served from the pack file
+
+        self.pack = None         # AssetPack from open_pack()
+        self.pack_dirty = False  # something asked for was not in the pack
+        self.loader = None       # AssetLoader filling the cache, set by the loader
+
+    @staticmethod
+    def key(path, size=None, alpha=True):
+        size = None if size is None else (int(size[0]), int(size[1]))
+        return normalize_path(path), size, bool(alpha)
+
+    # ---------------- REFERENCES ----------------
+    def acquire(self, path, size=None, alpha=True):
+        """Shared surface for path at size (None = as stored), convert_alpha()ed if alpha."""
+        key = self.key(path, size, alpha)
+        surface = self._request(key)
+        self.refs[key] = self.refs.get(key, 0) + 1
+        return surface
+
+    def release(self, path, size=None, alpha=True):
+        """Drop one acquire(); the surface becomes evictable at zero."""
+        key = self.key(path, size, alpha)
+        count = self.refs.get(key, 0) - 1
+        if count > 0:
+            self.refs[key] = count
+        else:
+            self.refs.pop(key, None)
+        self._trim()
+
+    def preload(self, path, size=None, alpha=True):
+        """Decode now, e.g. at level load, so a later acquire() never touches disk."""
+        self._request(self.key(path, size, alpha))
+
+    # ---------------- ATLAS ----------------
+    def pack_atlas(self, specs, cache_dir=None):
+        """
+        Pack (path, size) sprites into one SpriteAtlas and serve them from it.
+        With cache_dir the packed page is saved there and reused by later
+        runs, named by a hash of the specs and the source files' size and
+        mtime, so editing a PNG repacks it.
+        """
+        names = self._atlas_names(specs)
+        atlas = None
+        base = None
+        if cache_dir:
+            base = self._atlas_base(names, cache_dir)
+            if os.path.exists(base + ".json"):
+                try:
+                    # The page is an ordinary pinned entry, so the pack file can serve it
+                    atlas = SpriteAtlas.load(base, self.acquire)
+                except (OSError, ValueError, pygame.error):
+                    atlas = None
+        if atlas is None or not names.keys() <= atlas.regions.keys():
+            atlas = SpriteAtlas.pack({name: self._get(key) for name, key in names.items()})
+            page_key = self.key(base + ".png" if base else "<atlas %d>" % len(self.atlases))
+            if base:
+                # An unwritable cache only costs a repack next run
+                try:
+                    atlas.save(base)
+                    self.requested.add(page_key)
+                except (OSError, pygame.error):
+                    pass
+            self._store(page_key, atlas.page)
+            self.refs[page_key] = self.refs.get(page_key, 0) + 1
+
+        # Regions replace any standalone copies and own no bytes: the page does
+        for name, key in names.items():
+            self._drop(key)
+            self.entries[key] = atlas.sprite(name)
+            self.entry_bytes[key] = 0
+        self.atlases.append(atlas)
+        self._trim()
+        return atlas
+
+    def atlas_page(self, specs, cache_dir):
+        """Path of the cached page pack_atlas(specs, cache_dir) would load, or None if it has to pack."""
+        base = self._atlas_base(self._atlas_names(specs), cache_dir)
+        return base + ".png" if os.path.exists(base + ".json") else None
+
+    def atlas_name(self, path, size=None):
+        """Region name pack_atlas() gives the sprite path at size."""
+        path, size, _ = self.key(path, size)
+        return path if size is None else "%s@%dx%d" % (path, *size)
+
+    def _atlas_names(self, specs):
+        return {self.atlas_name(path, size): self.key(path, size) for path, size in specs}
+
+    @staticmethod
+    def _atlas_base(names, cache_dir):
+        h = hashlib.sha1()
+        for name in sorted(names):
+            st = os.stat(names[name][0])
+            h.update(f"{name}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+        return os.path.join(cache_dir, "atlas_" + h.hexdigest()[:16])
+
+    # ---------------- PACK FILE ----------------
+    def open_pack(self, path):
+        """Serve images from a file written by save_pack(); a missing or unreadable one serves nothing."""
+        self.pack = AssetPack.load(path)
+
+    def save_pack(self, path):
+        """
+        Write every requested image still cached (atlas pages included,
+        regions and sources that are gone left out) to path, if anything
+        was missing from the pack this run. Returns True if it wrote.
+        """
+        if not self.pack_dirty:
+            return False
+        images = [(key, self.entries[key]) for key in sorted(self.requested, key=repr)
+                  if key in self.entries and self.entry_bytes[key]]
+        if not AssetPack.save(path, images):
+            return False
+        self.pack_dirty = False
+        return True
+
+    # ---------------- BACKGROUND LOADING ----------------
+    def can_serve(self, key):
+        """True if key needs no decode: already cached, or current in the pack file."""
+        return key in self.entries or (self.pack is not None and self.pack.has(key))
+
+    def put(self, key, image):
+        """Store an image decoded (and scaled) off the main thread, converting it here."""
+        self.decodes += 1
+        self.requested.add(key)
+        self.pack_dirty = True
+        self._store(key, image.convert_alpha() if key[2] else image.convert())
+
+    # ---------------- STORAGE ----------------
+    def _request(self, key):
+        """_get() for an image the game asked for, trying the pack file before disk."""
+        self.requested.add(key)
+        if key not in self.entries:
+            surface = self.pack.get(key) if self.pack is not None else None
+            if surface is None:
+                self.pack_dirty = True
+            else:
+                self.pack_hits += 1
+                self._store(key, surface)
+        return self._get(key)
+
+    def _get(self, key):
+        surface = self.entries.get(key)
+        if surface is None and self.loader is not None:
+            # Still queued on the loader thread: wait rather than decode it twice
+            self.loader.wait_for(key)
+            surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            return surface
+
+        path, size, alpha = key
+        if size is None:
+            image = pygame.image.load(path)
+            self.decodes += 1
+            surface = image.convert_alpha() if alpha else image.convert()
+        else:
+            surface = pygame.transform.scale(self._get((path, None, alpha)), size)
+        self._store(key, surface)
+        return surface
+
+    def _store(self, key, surface):
+        self._drop(key)
+        self.entries[key] = surface
+        self.entry_bytes[key] = surface.get_pitch() * surface.get_height()
+        self.bytes += self.entry_bytes[key]
+        self._trim(keep=key)
+
+    def _drop(self, key):
+        if self.entries.pop(key, None) is not None:
+            self.bytes -= self.entry_bytes.pop(key)
+
+    def _trim(self, keep=None):
+        if self.bytes <= self.budget_bytes:
+            return
+        # Atlas regions free nothing (their page stays), so they are never dropped
+        for key in [k for k in self.entries if k not in self.refs and k != keep and self.entry_bytes[k]]:
+            self._drop(key)
+            if self.bytes <= self.budget_bytes:
+                return
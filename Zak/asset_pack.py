@@ -0,0 +1,124 @@
+# asset_pack.py
+import json
+import mmap
+import os
+import struct
+import pygame
+
+# Pack file: magic, header length (u64 LE), JSON header, then pixel blobs.
+# Blob offsets in the header are relative to the first 16-byte boundary after it.
+PACK_MAGIC = b"VSPACK1\0"
+PACK_ALIGN = 16
+
+
+def source_stamp(path):
+    """[size, mtime_ns] of a source file, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _aligned(n):
+    return -(-n // PACK_ALIGN) * PACK_ALIGN
+
+
+class AssetPack:
+    """
+    Images already decoded and scaled, kept in one file that is
+    memory-mapped: get() builds surfaces straight over the mapped pixels,
+    with no PNG decode and no scaling.
+
+    Entries are keyed like AssetCache, (path, size, alpha). One is ignored
+    once its source file's size or mtime changes; save() the images again
+    to refresh it.
+    """
+    def __init__(self):
+        self.data = None   # mmap of the file
+        self.start = 0     # where its blobs start
+        self.index = {}    # key -> header entry
+
+    @classmethod
+    def load(cls, path):
+        """Map a file written by save(); a missing or unreadable one gives an empty pack."""
+        pack = cls()
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(PACK_MAGIC)) != PACK_MAGIC:
+                    return pack
+                (header_len,) = struct.unpack("<Q", f.read(8))
+                header = json.loads(f.read(header_len))
+                # Copy-on-write: frombuffer wants a writable buffer, the file is never touched
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError, struct.error):
+            return pack
+        pack.data = data
+        pack.start = _aligned(len(PACK_MAGIC) + 8 + header_len)
+        pack.index = {
+            (e["path"], tuple(e["size"]) if e["size"] else None, e["alpha"]): e
+            for e in header["entries"]
+        }
+        return pack
+
+    @staticmethod
+    def save(path, images):
+        """
+        Write (key, surface) pairs to path, leaving out any whose source
+        file is gone. Returns False if the file could not be replaced.
+        """
+        entries, blobs, offset = [], [], 0
+        for key, surface in images:
+            stamp = source_stamp(key[0])
+            if stamp is None:
+                continue
+            # Tightly packed rows: frombuffer cannot be given a pitch
+            fmt = "BGRA" if key[2] else "RGBX"
+            data = pygame.image.tobytes(surface, fmt)
+            entries.append({"path": key[0], "size": key[1], "alpha": key[2], "source": stamp,
+                            "width": surface.get_width(), "height": surface.get_height(),
+                            "format": fmt, "offset": offset, "length": len(data)})
+            blobs.append(data)
+            offset = _aligned(offset + len(data))
+
+        header = json.dumps({"entries": entries}).encode()
+        data_start = _aligned(len(PACK_MAGIC) + 8 + len(header))
+        tmp = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(PACK_MAGIC + struct.pack("<Q", len(header)) + header)
+                for entry, data in zip(entries, blobs):
+                    f.seek(data_start + entry["offset"])
+                    f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            # e.g. the old pack is still mapped on Windows: keep it, try again next run
+            return False
+        return True
+
+    # ---------------- LOOKUP ----------------
+    def has(self, key):
+        """True if key is in the pack and its source file is unchanged."""
+        entry = self.index.get(key)
+        return entry is not None and entry["source"] == source_stamp(key[0])
+
+    def get(self, key):
+        """Surface for key over the mapped pixels (converted if it has to be), or None."""
+        if not self.has(key):
+            return None
+        entry = self.index[key]
+        start = self.start + entry["offset"]
+        pixels = memoryview(self.data)[start:start + entry["length"]]
+        surface = pygame.image.frombuffer(pixels, (entry["width"], entry["height"]), entry["format"])
+        if not key[2]:
+            # No frombuffer format matches the opaque display layout: one copy
+            return surface.convert()
+        if surface.get_masks() != _display_alpha_masks():
+            return surface.convert_alpha()
+        # Already what convert_alpha() would give: draw from the mapped pixels
+        return surface
+
+
+def _display_alpha_masks():
+    return pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
@@ -0,0 +1,83 @@
+# mask_layer.py
+import math
+import numpy as np
+from raycast import cast_rays, rects_to_array
+from spatial_hash import SpatialHash
+from occupancy_grid import OccupancyGrid
+from pvs import VisibilityGrid
+
+
+class MaskLayer:
+    """
+    Frozen view of the level geometry that exists under one mask.
+
+    platforms: every active platform, in level order
+    rects:     read-only (M, 4) array of the ones that can stop a ray
+    grid:      SpatialHash of platforms, for collision / area queries
+    ray_grid:  SpatialHash of row indices into rects, for culling rays
+    occupancy: OccupancyGrid of rects once bake_occupancy has run
+    visibility: VisibilityGrid (cell-to-cell PVS) once bake_visibility has run
+    """
+    def __init__(self, platforms, cell_size):
+        self.platforms = tuple(platforms)
+
+        # Same filter as rects_to_array, so row i of rects is occluders[i]
+        occluders = [p.rect for p in self.platforms if p.rect.width > 0 and p.rect.height > 0]
+        self.rects = rects_to_array(occluders)
+        self.rects.setflags(write=False)
+
+        self.grid = SpatialHash.from_items(self.platforms, cell_size)
+        self.ray_grid = SpatialHash(cell_size)
+        for row, rect in enumerate(occluders):
+            self.ray_grid.insert(row, rect)
+
+        self.occupancy = None
+        self.visibility = None
+
+    def bake_occupancy(self, cell_size, bounds):
+        """Bake the occluders into a DDA occupancy grid covering bounds."""
+        self.occupancy = OccupancyGrid(self.rects, cell_size, bounds)
+
+    def bake_visibility(self, cell_size, bounds, cache_dir=None):
+        """Bake (or load from cache_dir) the potentially-visible set over bounds."""
+        self.visibility = VisibilityGrid(self.rects, cell_size, bounds, cache_dir)
+
+    def may_see(self, start, end):
+        """PVS lookup: False only if start and end are certainly hidden from each other."""
+        return self.visibility is None or self.visibility.may_see(start, end)
+
+    def rects_near(self, center, radius):
+        """(rows, rects) of the occluders a light of this radius at center could reach."""
+        rows = np.asarray(self.ray_grid.query_radius(center, radius), dtype=int)
+        return rows, self.rects[rows]
+
+    def rects_along(self, start, end):
+        """(rows, rects) of the occluders in the grid cells the segment passes through."""
+        rows = np.asarray(self.ray_grid.query_segment(start, end), dtype=int)
+        return rows, self.rects[rows]
+
+    def cast_rays(self, origin, angles, max_dist):
+        """
+        raycast.cast_rays against the occluders within max_dist of origin.
+        hit_ids are rows of self.rects (-1 = miss), not of the culled subset,
+        so they name the same platform whatever the origin and radius.
+        """
+        rows, rects = self.rects_near(origin, max_dist)
+        points, dists, hit_ids = cast_rays(origin, angles, rects, max_dist)
+        hit = hit_ids >= 0
+        hit_ids[hit] = rows[hit_ids[hit]]
+        return points, dists, hit_ids
+
+    def line_of_sight(self, start, end):
+        """True if no occluder blocks the segment start -> end: one ray, culled by the grid."""
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return True
+        if not self.may_see(start, end):
+            return False
+        _, rects = self.rects_along(start, end)
+        if len(rects) == 0:
+            return True
+        _, _, hit_ids = cast_rays(start, (math.degrees(math.atan2(dy, dx)),), rects, length)
+        return hit_ids[0] < 0
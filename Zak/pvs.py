@@ -0,0 +1,141 @@
+# pvs.py
+import hashlib
+import math
+import os
+import numpy as np
+
+# Bump when the bake changes so old cache files are ignored
+PVS_VERSION = 1
+
+
+class VisibilityGrid:
+    """
+    Potentially-visible set over a uniform grid of cells: for every pair of
+    cells, one bit saying whether anything in one could see anything in the
+    other through the static occluders.
+
+    The bake is conservative: a pair is only marked hidden when a single
+    occluder provably cuts every segment between the two cells. So
+    may_see() == False is always right and callers can skip their raycast,
+    while True just means "do the real test".
+
+    rects: (M, 4) x0, y0, x1, y1 array (raycast.rects_to_array)
+    bounds: (x0, y0, x1, y1) world area to cover; points outside it are
+        never rejected.
+    cache_dir: if given, bakes are saved there as .npz files named by a hash
+        of the geometry, so a level is only baked the first time it loads.
+    """
+    def __init__(self, rects, cell_size, bounds, cache_dir=None):
+        self.cell_size = cell_size
+        bx0, by0, bx1, by1 = bounds
+        self.origin_x = math.floor(bx0 / cell_size) * cell_size
+        self.origin_y = math.floor(by0 / cell_size) * cell_size
+        self.cols = max(1, math.ceil((bx1 - self.origin_x) / cell_size))
+        self.rows = max(1, math.ceil((by1 - self.origin_y) / cell_size))
+
+        rects = np.ascontiguousarray(rects, dtype=float)
+        self.key = self._geometry_key(rects)
+
+        self.bits = None
+        path = os.path.join(cache_dir, f"pvs_{self.key}.npz") if cache_dir else None
+        if path and os.path.exists(path):
+            self.bits = self._load(path)
+        if self.bits is None:
+            self.bits = np.packbits(~self._bake_hidden(rects), axis=1)
+            if path:
+                self._save(path)
+
+    # ---------------- BAKE ----------------
+    def _geometry_key(self, rects):
+        h = hashlib.sha1()
+        h.update(np.array([PVS_VERSION, self.cell_size, self.origin_x, self.origin_y,
+                           self.cols, self.rows], dtype=float).tobytes())
+        h.update(rects.tobytes())
+        return h.hexdigest()[:16]
+
+    def _bake_hidden(self, rects):
+        """
+        (N, N) bool, True where one occluder blocks every segment between
+        two cells. For boxes that holds exactly when it blocks all 16
+        corner-to-corner segments (a segment that slips past has a
+        separating line, and the far corners are on its side too), so each
+        occluder needs one test per pair of grid vertices.
+        """
+        cs = self.cell_size
+        vx, vy = np.meshgrid(np.arange(self.cols + 1), np.arange(self.rows + 1))
+        px = (self.origin_x + vx * cs).ravel().astype(float)
+        py = (self.origin_y + vy * cs).ravel().astype(float)
+
+        # Cell (cx, cy) -> its four vertex indices
+        stride = self.cols + 1
+        top_left = (np.arange(self.rows)[:, None] * stride + np.arange(self.cols)[None, :]).ravel()
+        corners = (top_left, top_left + 1, top_left + stride, top_left + stride + 1)
+
+        dx = px[None, :] - px[:, None]
+        dy = py[None, :] - py[:, None]
+
+        n = self.cols * self.rows
+        hidden = np.zeros((n, n), dtype=bool)
+        for rect in rects:
+            # Shrunk a hair so "blocked" here always means crossing the inside
+            blocked = self._segments_hit(px, py, dx, dy, rect + (1e-6, 1e-6, -1e-6, -1e-6))
+            # Every corner of A to a vertex, then every corner of B
+            from_cell = blocked[corners[0]] & blocked[corners[1]] & blocked[corners[2]] & blocked[corners[3]]
+            hidden |= (from_cell[:, corners[0]] & from_cell[:, corners[1]]
+                       & from_cell[:, corners[2]] & from_cell[:, corners[3]])
+        return hidden
+
+    @staticmethod
+    def _segments_hit(px, py, dx, dy, rect):
+        """(V, V) bool: does the segment from vertex i to vertex j touch rect."""
+        x0, y0, x1, y1 = rect
+        t_near = np.zeros(dx.shape)
+        t_far = np.ones(dx.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for o, d, lo, hi in ((px[:, None], dx, x0, x1), (py[:, None], dy, y0, y1)):
+                t1, t2 = (lo - o) / d, (hi - o) / d
+                near, far = np.minimum(t1, t2), np.maximum(t1, t2)
+                # Parallel to this axis: inside the slab for all t, or never
+                inside = (o >= lo) & (o <= hi)
+                near = np.where(d == 0, np.where(inside, -np.inf, np.inf), near)
+                far = np.where(d == 0, np.where(inside, np.inf, -np.inf), far)
+                t_near = np.maximum(t_near, near)
+                t_far = np.minimum(t_far, far)
+        return t_near <= t_far
+
+    def _load(self, path):
+        n = self.cols * self.rows
+        try:
+            with np.load(path) as data:
+                bits = data["bits"]
+        except (OSError, ValueError, KeyError):
+            return None
+        if bits.shape != (n, (n + 7) // 8):
+            return None
+        return bits
+
+    def _save(self, path):
+        # A missing / read-only cache dir only costs a re-bake next time
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp.npz"
+            np.savez_compressed(tmp, bits=self.bits)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    # ---------------- QUERIES ----------------
+    def cell_of(self, point):
+        """Flat cell index of a world point, or -1 outside the grid."""
+        cx = math.floor((point[0] - self.origin_x) / self.cell_size)
+        cy = math.floor((point[1] - self.origin_y) / self.cell_size)
+        if 0 <= cx < self.cols and 0 <= cy < self.rows:
+            return cy * self.cols + cx
+        return -1
+
+    def may_see(self, a, b):
+        """False only if a and b are certainly hidden from each other."""
+        i, j = self.cell_of(a), self.cell_of(b)
+        if i < 0 or j < 0:
+            return True
+        return bool(self.bits[i, j >> 3] & (0x80 >> (j & 7)))
@@ -2,8 +2,17 @@ import pygame
 import sys
 import math
 import random
+from functools import partial
 from pathlib import Path
 from credits import EndCredits
+from raycast import fan_angles, to_point_list
+from light_mask import LightMask
+from mask_layer import MaskLayer
+from spatial_hash import SpatialHash
+from world_layer import WorldLayerCache
+from asset_cache import AssetCache
+from asset_loader import AssetLoader
+from sprite_variants import SpriteVariants
 
 pygame.init()
 
@@ -18,11 +27,45 @@ screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED | pygame.FULLSCR
 FPS = 60
 clock = pygame.time.Clock()
 
+# Every image goes through this cache: one decode per file, shared surfaces
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024  # bytes of unreferenced images kept around
+assets = AssetCache(ASSET_CACHE_BUDGET)
+# Last run's images, pre-scaled and memory-mapped: startup skips the PNG decodes
+ASSET_PACK_PATH = Path(__file__).resolve().parent / "pack_cache" / "assets.pack"
+assets.open_pack(str(ASSET_PACK_PATH))
+# Flipped / faded sprite copies, made once instead of every frame
+sprite_variants = SpriteVariants(max_entries=256, alpha_levels=16)
+
 WIDTH, HEIGHT = 1280, 720
 screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED | pygame.FULLSCREEN)
 
+# Homescreen: up before anything else loads, the rest streams in behind it (ASYNC LOADING)
+home_screen_img = assets.acquire("Charlotte/HomeScreen.png", (WIDTH, HEIGHT))
+screen.blit(home_screen_img, (0, 0))
+pygame.display.flip()
+
 DEBUG = False
 
+GRID_CELL_SIZE = 128  # px per spatial hash cell (collision, rays, scan)
+
+RAY_ENGINE = "slab"   # "slab" = exact batched rays, "dda" = walk the occupancy grid
+DDA_CELL_SIZE = 16    # px per occupancy cell
+DDA_PADDING = 300     # baked margin around the screen, at least the longest light radius
+
+PVS_CELL_SIZE = 32    # px per potentially-visible-set cell (enemy sight, is_in_light)
+PVS_CACHE_DIR = Path(__file__).resolve().parent / "pvs_cache"  # baked per level + mask, keyed by geometry hash
+
+# Light quality tiers: light buffer resolution, how it is upscaled on blit
+# (smoothscale, or plain nearest scale which is several times cheaper) and rays per cone
+QUALITY_PRESETS = {
+    "low":    {"light_scale": 0.25, "smooth_upscale": False, "ray_count": 24},
+    "medium": {"light_scale": 0.5,  "smooth_upscale": True,  "ray_count": 36},
+    "high":   {"light_scale": 1,    "smooth_upscale": True,  "ray_count": 50},
+}
+QUALITY = "high"
+LIGHT_SCALE = QUALITY_PRESETS[QUALITY]["light_scale"]
+SMOOTH_UPSCALE = QUALITY_PRESETS[QUALITY]["smooth_upscale"]
+
 MASKLESS = -1
 MASKLESS_COLOR = (255, 255, 255)
 
@@ -32,15 +75,12 @@ end_credits = None
 
 # Helper Functions
 
-def get_mask_color():
-    if current_mask == MASKLESS:
+def get_mask_color(mask=None):
+    if mask is None:
+        mask = current_mask
+    if mask == MASKLESS:
         return MASKLESS_COLOR
-    return MASK_INFO[current_mask]["color"]
-
-def load_background(path):
-    """Load background and scale to full screen."""
-    img = pygame.image.load(path).convert()  # convert() for performance
-    return pygame.transform.scale(img, (WIDTH, HEIGHT))
+    return MASK_INFO[mask]["color"]
 
 def game_over_screen():
     font = pygame.font.SysFont(None, 72)
@@ -81,6 +121,9 @@ MASK_INFO = {
     2: {"color": (90, 200, 130)},   # Puzzle
 }
 
+# Platforms are drawn slightly brighter than the mask color
+PLATFORM_COLORS = {mask: tuple(min(255, c + 20) for c in get_mask_color(mask)) for mask in (MASKLESS, *MASK_INFO)}
+
 # --------------- PUZZLE VARIABLES/CONSTANTS ----------------
 PUZZLE_COLORS = [
     (200, 60, 60),   # Red
@@ -116,74 +159,171 @@ DOOR_Y = 540    # top/bottom position
 DOOR_WIDTH = 50
 DOOR_HEIGHT = 100
 
+# ---------------- SPRITE ATLAS ----------------
+BOX_IMAGE = "Charlotte\BackgroundAssets\BigBoxLevel1 .png"
+TROLLEY_IMAGE = "Charlotte/BackgroundAssets/BoxTrolly.png"
+BOX_WITH_WHEELS_IMAGE = "Charlotte/BackgroundAssets/BoxWithWheels.png"
+BOX_SIZE = (128, 128)
+PLATE_IMAGE = "Charlotte/PreasurePlate.png"
+DOOR_IMAGE = "Charlotte/BackgroundAssets/Door.png"
+
+# Every small sprite, at its draw size, packed into one page. assets.acquire()
+# serves these from it, and the packed page is cached on disk so a warm start
+# decodes one PNG instead of one per sprite
+ATLAS_SPRITES = [
+    *((f"Charlotte/PlayerSprites/Player{state}{mask}.png", (CUBE_SIZE, CUBE_SIZE))
+      for state in ("Idle", "Running")
+      for mask in ("NoMask", "PlatformMask", "AttackMask", "PuzzleMask")),
+    ("Charlotte/ShadowMonster.png", (CUBE_SIZE, CUBE_SIZE)),
+    ("Charlotte/GhostSprite.png", (CUBE_SIZE, CUBE_SIZE)),
+    ("Charlotte/Red.png", None),
+    ("Charlotte/Green.png", None),
+    ("Charlotte/Blue.png", None),
+    (BOX_IMAGE, BOX_SIZE),
+    (TROLLEY_IMAGE, BOX_SIZE),
+    (BOX_WITH_WHEELS_IMAGE, BOX_SIZE),
+    (PLATE_IMAGE, (140, 140)),
+    (DOOR_IMAGE, (150, 150)),
+]
+ATLAS_CACHE_DIR = Path(__file__).resolve().parent / "atlas_cache"
+
+# ---------------- PLATFORM ----------------
+class Platform:
+    def __init__(self, rect, masks=None, visible=True):
+        self.rect = pygame.Rect(rect)
+        self.masks = masks  # None = always visible
+        self.visible = visible  # Can hide walls/platforms
+
+    def active(self, mask=None):
+        if mask is None:
+            mask = current_mask
+        if mask == MASKLESS:
+            return self.masks is None  # only walls & floor
+        if self.masks is None:
+            return True
+        return mask in self.masks
+
+    def draw(self):
+        if not self.active() or not self.visible:
+            return
+        pygame.draw.rect(screen, PLATFORM_COLORS[current_mask], self.rect, border_radius=4)
+
+# ---------------- LEVEL ----------------
+def load_level():
+    return [
+        Platform((0, 680, 1280, -80), None, visible=True),     # Floor always visible
+        Platform((0, 0, 40, 720), None, visible=True),        # Left wall always visible
+        Platform((1240, 0, 40, 720), None, visible=True),     # Right wall always visible
+        Platform((0, 120, 1280, 80), None, visible=True),     # Roof
+
+        # Mask-specific platforms
+        Platform((460, 500, 180, 25), [0]),
+        Platform((700, 420, 180, 25), [0]),
+        Platform((960, 340, 160, 25), [0]),
+        Platform((320, 360, 160, 25), [0]),
+        Platform((120, 280, 160, 25), [0,2]),
+    ]
+
+def build_mask_index(level_platforms):
+    """
+    Freeze, per mask, which platforms are active, their rect array and a
+    spatial hash over them. Collision and rays read the current mask's set
+    directly, so switching masks is a dictionary lookup instead of
+    re-testing every platform. The PVS is baked separately by
+    bake_visibility, on the loader thread.
+    """
+    bounds = (-DDA_PADDING, -DDA_PADDING, WIDTH + DDA_PADDING, HEIGHT + DDA_PADDING)
+    index = {}
+    for mask in (MASKLESS, *MASK_INFO):
+        layer = MaskLayer((p for p in level_platforms if p.active(mask)), GRID_CELL_SIZE)
+        layer.bake_occupancy(DDA_CELL_SIZE, bounds)
+        index[mask] = layer
+    return index
+
+def bake_visibility(layer):
+    """Bake (or load from PVS_CACHE_DIR) one layer's PVS; until then may_see() always says True."""
+    layer.bake_visibility(PVS_CELL_SIZE, (0, 0, WIDTH, HEIGHT), str(PVS_CACHE_DIR))
+
+platforms = load_level()
+platform_grid = SpatialHash.from_items(platforms, GRID_CELL_SIZE)  # every platform, any mask
+# The level is built once and its platforms never change at runtime, so the
+# caches below (VisionCache, world_layers) only key on mask and position. A
+# level switch added later must rebuild mask_index, call world_layers.invalidate()
+# and set vision_cache.key = None.
+mask_index = build_mask_index(platforms)
+
+# ---------------- ASYNC LOADING ----------------
+# Decoded on a background thread while the home screen is up. Anything the pack
+# file already holds is skipped; an acquire() of an image still loading waits for it
+atlas_page = assets.atlas_page(ATLAS_SPRITES, str(ATLAS_CACHE_DIR))
+STARTUP_ASSETS = [
+    *([(atlas_page, None)] if atlas_page else ATLAS_SPRITES),
+    ("Charlotte/Backgrounds/BackgroundA.png", (WIDTH, HEIGHT), False),
+    ("Charlotte/PlayerSprites/PlayerIdleNoMask.png", None),  # end credits
+]
+loader = AssetLoader(assets)
+for spec in STARTUP_ASSETS:
+    loader.queue(*spec)
+# The PVS bakes (or cache loads) run on the same thread, after the images
+for layer in mask_index.values():
+    loader.queue_task(partial(bake_visibility, layer))
+loader.start()
+
+LOADING_BAR_HEIGHT = 6
+
+start_requested = False
+waiting_for_input = True
+while waiting_for_input:
+    clock.tick(FPS)  # also leaves the loader thread the GIL between frames
+    loader.pump()
+    screen.fill((0, 0, 0))
+    screen.blit(home_screen_img, (0, 0))
+    if not loader.done:
+        bar_width = int(WIDTH * loader.progress())
+        pygame.draw.rect(screen, (255, 255, 255), (0, HEIGHT - LOADING_BAR_HEIGHT, bar_width, LOADING_BAR_HEIGHT))
+    pygame.display.flip()
+
+    for e in pygame.event.get():
+        if e.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        if e.type == pygame.KEYDOWN:
+            if e.key == pygame.K_RETURN:
+                start_requested = True
+            if e.key == pygame.K_ESCAPE:
+                pygame.quit()
+                sys.exit()
+
+    # Enter before loading is done starts the game as soon as it is
+    if start_requested and loader.done:
+        waiting_for_input = False
+
+sprite_atlas = assets.pack_atlas(ATLAS_SPRITES, str(ATLAS_CACHE_DIR))
+
 # ---------------- PLAYER SPRITES ----------------
 
 PLAYER_SPRITES = {
     MASKLESS: {
-        "idle": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte/PlayerSprites/PlayerIdleNoMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
-        "run": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte/PlayerSprites/PlayerRunningNoMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
+        "idle": assets.acquire("Charlotte/PlayerSprites/PlayerIdleNoMask.png", (CUBE_SIZE, CUBE_SIZE)),
+        "run": assets.acquire("Charlotte/PlayerSprites/PlayerRunningNoMask.png", (CUBE_SIZE, CUBE_SIZE)),
     },
 
     0: {  # Spectral mask
-        "idle": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerIdlePlatformMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
-        "run": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerRunningPlatformMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
+        "idle": assets.acquire("Charlotte\PlayerSprites\PlayerIdlePlatformMask.png", (CUBE_SIZE, CUBE_SIZE)),
+        "run": assets.acquire("Charlotte\PlayerSprites\PlayerRunningPlatformMask.png", (CUBE_SIZE, CUBE_SIZE)),
     },
 
     1: {  # Physical mask
-        "idle": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerIdleAttackMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
-        "run": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerRunningAttackMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
+        "idle": assets.acquire("Charlotte\PlayerSprites\PlayerIdleAttackMask.png", (CUBE_SIZE, CUBE_SIZE)),
+        "run": assets.acquire("Charlotte\PlayerSprites\PlayerRunningAttackMask.png", (CUBE_SIZE, CUBE_SIZE)),
     },
 
     2: {  # Puzzle mask
-        "idle": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerIdlePuzzleMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
-        "run": pygame.transform.scale(
-            pygame.image.load(
-                "Charlotte\PlayerSprites\PlayerRunningPuzzleMask.png"
-            ).convert_alpha(),
-            (CUBE_SIZE, CUBE_SIZE)
-        ),
+        "idle": assets.acquire("Charlotte\PlayerSprites\PlayerIdlePuzzleMask.png", (CUBE_SIZE, CUBE_SIZE)),
+        "run": assets.acquire("Charlotte\PlayerSprites\PlayerRunningPuzzleMask.png", (CUBE_SIZE, CUBE_SIZE)),
     },
 }
 
-# Homescreen
-home_screen_img = pygame.image.load("Charlotte/HomeScreen.png").convert_alpha()
-home_screen_img = pygame.transform.scale(home_screen_img, (WIDTH, HEIGHT))
-
 # Backgrounds
 BACKGROUND_1 = 0
 BACKGROUND_2 = 1
@@ -191,10 +331,7 @@ BACKGROUND_3 = 2
 
 def load_background(path):
     """Load and scale background to full screen."""
-    return pygame.transform.scale(
-        pygame.image.load(path).convert(),
-        (WIDTH, HEIGHT)
-    )
+    return assets.acquire(path, (WIDTH, HEIGHT), alpha=False)  # convert() for performance
 
 # Registry of backgrounds
 BACKGROUNDS = {
@@ -205,10 +342,6 @@ BACKGROUNDS = {
 
 current_background = BACKGROUND_1
 
-def draw_background():
-    """Draw the current background full-screen."""
-    screen.blit(BACKGROUNDS[current_background], (0, 0))
-
 
 # Player Variables/Constants
 vel_x = 0
@@ -237,10 +370,12 @@ HINT_COUNTS = {
 }
 
 HINT_IMAGES = {
-    "Red": pygame.image.load("Charlotte\Red.png").convert_alpha(),
-    "Green": pygame.image.load("Charlotte\Green.png").convert_alpha(),
-    "Blue": pygame.image.load("Charlotte\Blue.png").convert_alpha(),
+    "Red": assets.acquire("Charlotte\Red.png"),
+    "Green": assets.acquire("Charlotte\Green.png"),
+    "Blue": assets.acquire("Charlotte\Blue.png"),
 }
+# Atlas regions of the hint images, drawn through sprite_atlas.blits
+HINT_SPRITES = {hint_type: assets.atlas_name("Charlotte/%s.png" % hint_type) for hint_type in HINT_IMAGES}
 
 HINT_POSITIONS = {
     "Red": [(200, 400)],
@@ -249,9 +384,7 @@ HINT_POSITIONS = {
 }
 
 # Enemy image
-enemy1_img = pygame.image.load("Charlotte\ShadowMonster.png"
-).convert_alpha()
-enemy1_img = pygame.transform.scale(enemy1_img, (CUBE_SIZE, CUBE_SIZE))
+enemy1_img = assets.acquire("Charlotte\ShadowMonster.png", (CUBE_SIZE, CUBE_SIZE))
 
 # ---------------- MASK ----------------
 current_mask = MASKLESS
@@ -263,6 +396,7 @@ ENEMY_GRAVITY = 0.7
 ENEMY_MAX_FALL = 18
 ENEMY_VISION_RADIUS = 235
 ENEMY_FOV = 160
+ENEMY_SIGHT_INTERVAL = 3  # frames between line-of-sight checks (1 = every frame)
 
 ENEMY_MAX_HEALTH = 2
 ATTACK_DAMAGE = 1
@@ -301,6 +435,10 @@ scan_radius = 0
 scan_active = False
 
 # ---------------- IN-GAME BOX/TROLLEY MANAGEMENT ----------------
+# Decoded and scaled up front (they are atlas regions already) so spawning / merging never touches disk
+for path in (BOX_IMAGE, TROLLEY_IMAGE, BOX_WITH_WHEELS_IMAGE):
+    assets.preload(path, BOX_SIZE)
+
 boxes = []
 trolleys = []
 box_spawned = False
@@ -312,27 +450,6 @@ player_on_trolley = None
 blue_flash_timer = 0
 BLUE_FLASH_DURATION = int(0.5 * FPS)  # 0.5 seconds in frames
 
-# ---------------- PLATFORM ----------------
-class Platform:
-    def __init__(self, rect, masks=None, visible=True):
-        self.rect = pygame.Rect(rect)
-        self.masks = masks  # None = always visible
-        self.visible = visible  # Can hide walls/platforms
-
-    def active(self):
-        if current_mask == MASKLESS:
-            return self.masks is None  # only walls & floor
-        if self.masks is None:
-            return True
-        return current_mask in self.masks
-
-    def draw(self):
-        if not self.active() or not self.visible:
-            return
-        base = get_mask_color()
-        color = tuple(min(255, c + 20) for c in base)
-        pygame.draw.rect(screen, color, self.rect, border_radius=4)
-
 # ---------------- BOX / TROLLEY ----------------
 class Box:
     def __init__(self, x, y, width, height, image_path=None, hit_offset_x=46, hit_offset_y=50, hitbox_size=35):
@@ -343,12 +460,14 @@ class Box:
         self.saved_pos = self.rect.topleft
         self.active_in_game = True  # Only active in puzzle mask
         self.image_path = image_path
+        self.image_size = (width, height)
 
-        if image_path:
-            self.image = pygame.image.load(image_path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (width, height))
-        else:
-            self.image = None
+        # Shared with every other box using this image, never loaded mid-frame
+        # once preloaded (see IN-GAME BOX/TROLLEY MANAGEMENT)
+        self.image = assets.acquire(image_path, self.image_size) if image_path else None
+        self.image_held = self.image is not None
+        # Region name in sprite_atlas, or None for an image drawn on its own
+        self.atlas_name = assets.atlas_name(image_path, self.image_size) if image_path else None
 
         self.hit_offset_x = hit_offset_x
         self.hit_offset_y = hit_offset_y
@@ -360,18 +479,24 @@ class Box:
             self.hitbox_size
         )
 
+    def release(self):
+        """Hand the sprite back to the asset cache when this box leaves the game."""
+        if self.image_held:
+            assets.release(self.image_path, self.image_size)
+            self.image_held = False
+
     def apply_gravity(self, gravity=0.7, max_fall=18):
         if not self.active_in_game:
             return
         self.vel_y = min(self.vel_y + gravity, max_fall)
 
-    def move_and_collide(self, platforms):
+    def move_and_collide(self, platform_grid):
         if not self.active_in_game:
             return
 
         # Horizontal collisions
         self.hit_rect.x += self.vel_x
-        for p in platforms:
+        for p in platform_grid.query_rect(self.hit_rect):
             if self.hit_rect.colliderect(p.rect):
                 if self.vel_x > 0:
                     self.hit_rect.right = p.rect.left
@@ -383,7 +508,7 @@ class Box:
         # Vertical collisions
         self.hit_rect.y += self.vel_y
         self.on_ground = False
-        for p in platforms:
+        for p in platform_grid.query_rect(self.hit_rect):
             if self.hit_rect.colliderect(p.rect):
                 if self.vel_y > 0:
                     self.hit_rect.bottom = p.rect.top
@@ -411,7 +536,7 @@ class Box:
                 # Player on right pushes left
                 self.vel_x += player_vel_x
 
-    def update(self, platforms):
+    def update(self, platform_grid):
         # Only active in puzzle mask
         if current_mask == 2:
             self.active_in_game = True
@@ -422,7 +547,7 @@ class Box:
             return
 
         self.apply_gravity()
-        self.move_and_collide(platforms)
+        self.move_and_collide(platform_grid)
         self.vel_x *= 0.8
         if abs(self.vel_x) < 0.1:
             self.vel_x = 0
@@ -453,12 +578,12 @@ class Trolley(Box):
             self.hitbox_size - hit_shrink_y
         )
 
-    def blocked_horizontally(self, platforms, direction):
+    def blocked_horizontally(self, platform_grid, direction):
         if not self.active_in_game:
             return False
         test = self.hit_rect.copy()
         test.x += direction
-        for p in platforms:
+        for p in platform_grid.query_rect(test):
             if test.colliderect(p.rect):
                 return True
         return False
@@ -471,8 +596,7 @@ class PressurePlate:
         # --- LOAD PLATE IMAGE ---
         plate_image_width = 140
         plate_image_height = 140
-        self.image = pygame.image.load(plate_img_path).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (plate_image_width, plate_image_height))
+        self.image = assets.acquire(plate_img_path, (plate_image_width, plate_image_height))
         self.image_offset_x = self.rect.centerx - plate_image_width // 2
         self.image_offset_y = self.rect.bottom - plate_image_height - 17.5
 
@@ -480,10 +604,9 @@ class PressurePlate:
         self.door_rect = pygame.Rect(door_x, door_y, door_w, door_h)
 
         # --- LOAD DOOR IMAGE ---
-        self.door_image = pygame.image.load(door_img_path).convert_alpha()
         door_image_width = 150
         door_image_height = 150
-        self.door_image = pygame.transform.scale(self.door_image, (door_image_width, door_image_height))
+        self.door_image = assets.acquire(door_img_path, (door_image_width, door_image_height))
 
         # --- CENTER IMAGE ON HITBOX ---
         self.door_image_offset_x = self.door_rect.centerx - door_image_width // 2
@@ -504,7 +627,7 @@ class PressurePlate:
                 self.active = True
                 break
 
-    def draw(self, screen, mask, player_center, facing_angle):
+    def draw(self, screen, mask, door_lit):
         # --- PRESSURE PLATE ---
         if mask == 2:  # Only Puzzle Mask
             # Always draw the plate (no light check)
@@ -516,7 +639,7 @@ class PressurePlate:
         # --- DOOR ---
         if self.active:
             # Only draw door if in light cone OR DEBUG
-            if DEBUG or is_in_light(self.door_rect, player_center, facing_angle):
+            if DEBUG or door_lit:
                 screen.blit(self.door_image, (self.door_image_offset_x, self.door_image_offset_y))
 
             if DEBUG:
@@ -531,9 +654,9 @@ pressure_plate_y = FLOOR_Y - PLATE_HEIGHT
 
 pressure_plate = PressurePlate(
     1000, pressure_plate_y, 30, PLATE_HEIGHT,  # Plate hitbox aligned to top of floor
-    "Charlotte/PreasurePlate.png",
+    PLATE_IMAGE,
     DOOR_X, DOOR_Y, DOOR_WIDTH, DOOR_HEIGHT,
-    "Charlotte/BackgroundAssets/Door.png"
+    DOOR_IMAGE
 )
 
 # ---------------- PUZZLE TRIGGER ----------------
@@ -551,32 +674,32 @@ class PuzzleTrigger:
 
 puzzle_trigger = PuzzleTrigger(180, 240)
 
-# ---------------- LEVEL ----------------
-def load_level():
-    return [
-        Platform((0, 680, 1280, -80), None, visible=True),     # Floor always visible
-        Platform((0, 0, 40, 720), None, visible=True),        # Left wall always visible
-        Platform((1240, 0, 40, 720), None, visible=True),     # Right wall always visible
-        Platform((0, 120, 1280, 80), None, visible=True),     # Roof
+def active_platforms():
+    """Platforms that exist under the current mask."""
+    return mask_index[current_mask].platforms
 
-        # Mask-specific platforms
-        Platform((460, 500, 180, 25), [0]),
-        Platform((700, 420, 180, 25), [0]),
-        Platform((960, 340, 160, 25), [0]),
-        Platform((320, 360, 160, 25), [0]),
-        Platform((120, 280, 160, 25), [0,2]),
-    ]
+def render_world_layer(surface, key):
+    """Background plus the platforms of one mask, for WorldLayerCache."""
+    mask, background = key
+    surface.blit(BACKGROUNDS[background], (0, 0))
+    color = PLATFORM_COLORS[mask]
+    for p in mask_index[mask].platforms:
+        if p.visible:
+            pygame.draw.rect(surface, color, p.rect, border_radius=4)
 
-platforms = load_level()
+# Static world per (mask, background), rendered once
+world_layers = WorldLayerCache((WIDTH, HEIGHT), render_world_layer)
+world_layers.prerender((mask, current_background) for mask in mask_index)
 
 # ---------------- COLLISION ----------------
 def move_and_collide(rect, dx, dy):
     global on_ground
 
     rect.x += dx
-    for p in platforms:
-        # Only collide if platform is active for current mask
-        if p.active() and rect.colliderect(p.rect):
+    # Only collide with platforms active for the current mask
+    layer = mask_index[current_mask]
+    for p in layer.grid.query_rect(rect):
+        if rect.colliderect(p.rect):
             if dx > 0:
                 rect.right = p.rect.left
             elif dx < 0:
@@ -584,8 +707,8 @@ def move_and_collide(rect, dx, dy):
 
     rect.y += dy
     on_ground = False
-    for p in platforms:
-        if p.active() and rect.colliderect(p.rect):
+    for p in layer.grid.query_rect(rect):
+        if rect.colliderect(p.rect):
             if dy > 0:
                 rect.bottom = p.rect.top
                 on_ground = True
@@ -615,63 +738,34 @@ def get_player_attack_rect():
 # ---------------- LIGHT ----------------
 LIGHT_RADIUS = 280
 FOV_ANGLE = 90
-light_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-
-RAY_COUNT = 50
-RAY_STEP = 4
+light_surface = pygame.Surface((round(WIDTH * LIGHT_SCALE), round(HEIGHT * LIGHT_SCALE)), pygame.SRCALPHA)
+# Full-res target for the upscaled light buffer; not needed at scale 1
+light_upscaled = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) if LIGHT_SCALE != 1 else None
 
+RAY_COUNT = QUALITY_PRESETS[QUALITY]["ray_count"]
 
-def cast_ray(origin, angle):
-    ox, oy = origin
-    rad = math.radians(angle)
-    dx = math.cos(rad)
-    dy = math.sin(rad)
 
-    for i in range(0, LIGHT_RADIUS, RAY_STEP):
-        px = ox + dx * i
-        py = oy + dy * i
-        for p in platforms:
-            if p.active() and p.rect.collidepoint(px, py):
-                return (px, py)
+def cast_light_rays(origin, angles, radius):
+    """Cast a fan against the current mask with whichever RAY_ENGINE is set."""
+    if RAY_ENGINE == "dda":
+        return mask_index[current_mask].occupancy.cast_rays(origin, angles, radius)
+    return mask_index[current_mask].cast_rays(origin, angles, radius)
 
-    return (ox + dx * LIGHT_RADIUS, oy + dy * LIGHT_RADIUS)
-
-def cast_ray_enemy(origin, angle):
-    ox, oy = origin
-    rad = math.radians(angle)
-    dx = math.cos(rad)
-    dy = math.sin(rad)
-
-    for i in range(0, ENEMY_VISION_RADIUS, RAY_STEP):
-        px = ox + dx * i
-        py = oy + dy * i
-
-        for p in platforms:
-            if p.active() and p.rect.collidepoint(px, py):
-                return (px, py)
-
-    return (ox + dx * ENEMY_VISION_RADIUS, oy + dy * ENEMY_VISION_RADIUS)
-
-def get_vision_polygon(origin):
-    points = [origin]
-    start = facing_angle - FOV_ANGLE / 2
-    step = FOV_ANGLE / RAY_COUNT
-    for i in range(RAY_COUNT + 1):
-        points.append(cast_ray(origin, start + i * step))
-    return points
+def get_vision_polygon(origin, angle=None):
+    if angle is None:
+        angle = facing_angle
+    angles = fan_angles(angle - FOV_ANGLE / 2, FOV_ANGLE, RAY_COUNT)
+    points, _, _ = cast_light_rays(origin, angles, LIGHT_RADIUS)
+    return to_point_list(origin, points)
 
 def get_enemy_vision_polygon(enemy):
     origin = enemy.rect.center
-    points = [origin]
-
     start_angle = -ENEMY_FOV / 2 if enemy.facing_right else 180 - ENEMY_FOV / 2
 
-    for i in range(int(ENEMY_FOV) + 1):
-        angle = start_angle + i
-        end_point = cast_ray_enemy(origin, angle)
-        points.append(end_point)
-
-    return points
+    # one ray per degree, all cast in a single batch
+    angles = fan_angles(start_angle, int(ENEMY_FOV), int(ENEMY_FOV))
+    points, _, _ = cast_light_rays(origin, angles, ENEMY_VISION_RADIUS)
+    return to_point_list(origin, points)
 
 def point_in_polygon(point, poly):
     x, y = point
@@ -684,12 +778,74 @@ def point_in_polygon(point, poly):
             inside = not inside
     return inside
 
+class VisionCache:
+    """
+    The player's light cone, raycast at most once per tick.
+    Everything that asks "is this lit?" shares the same polygon; it is only
+    rebuilt when the origin, facing angle or mask change (the level's
+    platforms are fixed, see mask_index).
+    Lit tests go through a 1-bit raster of the cone, so each one is a single
+    bit lookup (points) or mask overlap (rects) instead of a polygon walk.
+    """
+    def __init__(self):
+        self.key = None
+        self.polygon = None
+        self.builds = 0  # how many times the cone was actually raycast
+        self.light_mask = LightMask()
+        self.mask_stale = True
+
+    def get_polygon(self, origin, angle):
+        key = (tuple(origin), angle, current_mask)
+        if key != self.key:
+            self.polygon = get_vision_polygon(origin, angle)
+            self.key = key
+            self.builds += 1
+            self.mask_stale = True
+        return self.polygon
+
+    def get_mask(self, origin, angle):
+        polygon = self.get_polygon(origin, angle)
+        if self.mask_stale:
+            self.light_mask.from_polygon(polygon)
+            self.mask_stale = False
+        return self.light_mask
+
+    def contains(self, point, origin, angle):
+        return self.get_mask(origin, angle).is_point_lit(point)
+
+    def overlaps(self, rect, origin, angle):
+        return self.get_mask(origin, angle).is_rect_lit(rect)
+
+    def lit_points(self, points, origin, angle):
+        return self.get_mask(origin, angle).lit_points(points)
+
+    def lit_rects(self, rects, origin, angle):
+        return self.get_mask(origin, angle).lit_rects(rects)
+
+vision_cache = VisionCache()
+
 def is_in_light(rect, light_origin, facing_angle):
     """
     Returns True if the center of rect is inside the player's light cone.
     """
-    poly = get_vision_polygon(light_origin)
-    return point_in_polygon(rect.center, poly)
+    # Baked PVS: a platform certainly hides it, skip the cone mask
+    if not mask_index[current_mask].may_see(light_origin, rect.center):
+        return False
+    return vision_cache.contains(rect.center, light_origin, facing_angle)
+
+def lit_in_light(rects, light_origin, facing_angle):
+    """
+    is_in_light for many rects in one pass: a list of bools, one per rect.
+    The cone mask is tested for every center at once; only the few that
+    come back lit still go through the PVS.
+    """
+    centers = [r.center for r in rects]
+    lit = vision_cache.lit_points(centers, light_origin, facing_angle).tolist()
+    layer = mask_index[current_mask]
+    for i, center in enumerate(centers):
+        if lit[i] and not layer.may_see(light_origin, center):
+            lit[i] = False
+    return lit
 
 def draw_light(origin):
     global pulse_timer
@@ -700,9 +856,8 @@ def draw_light(origin):
     if DEBUG:
         # Clear the screen for debug mode too
         screen.fill((30, 30, 30))  # simple dark grey for debug
-        for p in platforms:
-            if p.active():
-                p.draw()
+        for p in active_platforms():
+            p.draw()
         # Skip lighting entirely in debug
         return
 
@@ -711,30 +866,34 @@ def draw_light(origin):
     pulse_radius = MIN_PULSE_RADIUS + (MAX_PULSE_RADIUS - MIN_PULSE_RADIUS) * (
         0.5 + 0.5 * math.sin(pulse_timer * PULSE_SPEED * math.pi)
     )
-    mini_spot = pygame.Surface((pulse_radius * 2, pulse_radius * 2), pygame.SRCALPHA)
+    # Everything on light_surface is drawn in light-buffer pixels
+    spot_radius = pulse_radius * LIGHT_SCALE
+    mini_spot = pygame.Surface((spot_radius * 2, spot_radius * 2), pygame.SRCALPHA)
     pygame.draw.circle(
         mini_spot,
         (255, 255, 200, 100),
-        (pulse_radius, pulse_radius),
-        int(pulse_radius)
+        (spot_radius, spot_radius),
+        int(spot_radius)
     )
     light_surface.blit(
         mini_spot,
-        (origin[0] - pulse_radius, origin[1] - pulse_radius),
+        (origin[0] * LIGHT_SCALE - spot_radius, origin[1] * LIGHT_SCALE - spot_radius),
         special_flags=pygame.BLEND_RGBA_ADD
     )
 
     # --- Main cone light ---
-    poly = get_vision_polygon(origin)
+    poly = vision_cache.get_polygon(origin, facing_angle)
+    if LIGHT_SCALE != 1:
+        poly = [(x * LIGHT_SCALE, y * LIGHT_SCALE) for x, y in poly]
     pygame.draw.polygon(light_surface, (255, 255, 180, 200), poly)
 
-    # --- Draw background and platforms ---
-    draw_background()
-    for p in platforms:
-        p.draw()
-
     # --- Apply lighting ---
-    screen.blit(light_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    lighting = light_surface
+    if light_upscaled is not None:
+        upscale = pygame.transform.smoothscale if SMOOTH_UPSCALE else pygame.transform.scale
+        upscale(light_surface, (WIDTH, HEIGHT), light_upscaled)
+        lighting = light_upscaled
+    screen.blit(lighting, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
 
 # ---------------- ENEMY ----------------
 class Enemy:
@@ -751,6 +910,10 @@ class Enemy:
         self.death_timer = 30   # frames
         self.dying = False
 
+        # Cached sight result; timers start staggered so enemies don't all check on one frame
+        self.sees_player = False
+        self.sight_timer = random.randint(1, ENEMY_SIGHT_INTERVAL)
+
     def can_see_player(self, pos):
         dx, dy = pos[0] - self.rect.centerx, pos[1] - self.rect.centery
         dist = math.hypot(dx, dy)
@@ -759,7 +922,18 @@ class Enemy:
         angle = math.degrees(math.atan2(dy, dx))
         facing = 0 if self.facing_right else 180
         delta = (angle - facing + 180) % 360 - 180
-        return abs(delta) < ENEMY_FOV / 2
+        if abs(delta) >= ENEMY_FOV / 2:
+            return False
+        # In range and in view: PVS lookup, then one ray if that can't decide
+        return mask_index[current_mask].line_of_sight(self.rect.center, pos)
+
+    def update_sight(self, pos):
+        """can_see_player, re-evaluated every ENEMY_SIGHT_INTERVAL frames."""
+        self.sight_timer -= 1
+        if self.sight_timer <= 0:
+            self.sees_player = self.can_see_player(pos)
+            self.sight_timer = ENEMY_SIGHT_INTERVAL
+        return self.sees_player
 
     def patrol(self):
         self.vel_x = ENEMY_SPEED if self.facing_right else -ENEMY_SPEED
@@ -793,7 +967,7 @@ class Enemy:
 
         global player_health, damage_timer
 
-        self.alerted = self.can_see_player(player.center)
+        self.alerted = self.update_sight(player.center)
         self.facing_right = player.centerx > self.rect.centerx if self.alerted else self.facing_right
         self.chase() if self.alerted else self.patrol()
 
@@ -805,23 +979,16 @@ class Enemy:
             player_health -= 1
             damage_timer = INVULN_TIME
 
-    def draw_body(self, vision_poly):
+    def draw_body(self, lit):
         if self.dead:
             return
 
         if current_mask == 3:
             return
 
-        if current_mask == 1 and point_in_polygon(self.rect.center, vision_poly):
-            img = enemy1_img
-            if not self.facing_right:
-                img = pygame.transform.flip(enemy1_img, True, False)
-
-            if self.dying:
-                alpha = int(255 * (self.death_timer / 30))
-                img = img.copy()
-                img.set_alpha(alpha)
-
+        if current_mask == 1 and lit:
+            alpha = int(255 * (self.death_timer / 30)) if self.dying else 255
+            img = sprite_variants.get(enemy1_img, flip_x=not self.facing_right, alpha=alpha)
             screen.blit(img, self.rect.topleft)
 
     def draw_eyes(self):
@@ -855,8 +1022,7 @@ class Ghost:
 
         # Load a ghost image (or fallback to white rectangle)
         try:
-            self.image = pygame.image.load("Charlotte\GhostSprite.png").convert_alpha()
-            self.image = pygame.transform.scale(self.image, (CUBE_SIZE, CUBE_SIZE))
+            self.image = assets.acquire("Charlotte\GhostSprite.png", (CUBE_SIZE, CUBE_SIZE))
         except:
             self.image = None
 
@@ -944,22 +1110,8 @@ enemy = Enemy(600, 384)
 ghost = Ghost(400, 300)
 player_stunned_timer = 0
 
-waiting_for_input = True
-while waiting_for_input:
-    screen.fill((0, 0, 0))
-    screen.blit(home_screen_img, (0, 0))
-    pygame.display.flip()
-
-    for e in pygame.event.get():
-        if e.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        if e.type == pygame.KEYDOWN:
-            if e.key == pygame.K_RETURN:
-                waiting_for_input = False
-            if e.key == pygame.K_ESCAPE:
-                pygame.quit()
-                sys.exit()
+# Rewrites the pack only if something above was missing from it or out of date
+assets.save_pack(str(ASSET_PACK_PATH))
 
 # -------- GAME LOOP --------
 running = True
@@ -1079,17 +1231,15 @@ while running:
 
     # --- BOX SPAWN ---
     if not box_spawned and puzzle_values == PUZZLE_SOLUTION:
-        box_image_path = "Charlotte\BackgroundAssets\BigBoxLevel1 .png"
         box_x = 600
         box_y = 200  # underneath roof
-        boxes.append(Box(box_x, box_y, 128, 128, box_image_path))
+        boxes.append(Box(box_x, box_y, *BOX_SIZE, BOX_IMAGE))
         box_spawned = True
 
     # --- TROLLEY SPAWN ---
     if not trolley_spawned:
-        trolley_image_path = "Charlotte/BackgroundAssets/BoxTrolly.png"
-        trolley_y = 680 - 128  # sit on floor
-        trolleys.append(Trolley(600, trolley_y, 128, 128, trolley_image_path))
+        trolley_y = 680 - BOX_SIZE[1]  # sit on floor
+        trolleys.append(Trolley(600, trolley_y, *BOX_SIZE, TROLLEY_IMAGE))
         trolley_spawned = True
 
     # --- BOX + TROLLEY MERGE INTO BOX WITH WHEELS ---
@@ -1100,13 +1250,13 @@ while running:
             merged = False
             for trolley in trolleys:
                 if box.hit_rect.colliderect(trolley.hit_rect):
-                    box_with_wheels_image = "Charlotte/BackgroundAssets/BoxWithWheels.png"
                     merged_box = Box(box.hit_rect.x - box.hit_offset_x,
                                      box.hit_rect.y - box.hit_offset_y,
                                      box.rect.width,
                                      box.rect.height,
-                                     box_with_wheels_image)
+                                     BOX_WITH_WHEELS_IMAGE)
                     new_boxes.append(merged_box)
+                    box.release()
                     merged = True
                     break
             if not merged:
@@ -1114,6 +1264,8 @@ while running:
         for trolley in trolleys:
             if not any(box.hit_rect.colliderect(trolley.hit_rect) for box in boxes):
                 new_trolleys.append(trolley)
+            else:
+                trolley.release()
         boxes = new_boxes
         trolleys = new_trolleys
 
@@ -1125,8 +1277,8 @@ while running:
             trolley.push(player, vel_x)
 
     if current_mask == 2:
-        for box in boxes: box.update(platforms)
-        for trolley in trolleys: trolley.update(platforms)
+        for box in boxes: box.update(platform_grid)
+        for trolley in trolleys: trolley.update(platform_grid)
 
     pressure_plate.update(boxes)
 
@@ -1139,7 +1291,7 @@ while running:
         show_end_credits = True
 
     if show_end_credits:
-        end_credits = EndCredits(screen, pygame.image.load("Charlotte/PlayerSprites/PlayerIdleNoMask.png").convert_alpha(), "Owen/Fonts/DefaultFont.ttf")
+        end_credits = EndCredits(screen, assets.acquire("Charlotte/PlayerSprites/PlayerIdleNoMask.png"), "Owen/Fonts/DefaultFont.ttf")
         end_credits.run()
         running = False
         continue
@@ -1180,6 +1332,8 @@ while running:
             ghost.visible = True
             ghost.stunned_timer = 0
             ghost.shake_timer = 0
+            for box in boxes + trolleys:
+                box.release()
             boxes.clear()
             trolleys.clear()
             box_spawned = False
@@ -1202,19 +1356,13 @@ while running:
     shake_offset_x, shake_offset_y = ghost.apply_shake()
 
     # -------- DRAW --------
-    # Draw background
-    screen.blit(BACKGROUNDS[current_background], (0 + shake_offset_x, 0 + shake_offset_y))
-
-    # Draw platforms
-    for p in platforms:
-        if p.active():
-            rect = p.rect.move(shake_offset_x, shake_offset_y)
-            base = get_mask_color()
-            color = tuple(min(255, c + 20) for c in base)
-            pygame.draw.rect(screen, color, rect, border_radius=4)
+    # Draw background + platforms (one cached layer per mask), the only world draw
+    if shake_offset_x or shake_offset_y:
+        screen.fill((0, 0, 0))  # the shaken layer leaves a strip uncovered
+    screen.blit(world_layers.get((current_mask, current_background)), (shake_offset_x, shake_offset_y))
 
 # --- DEBUG OVERLAYS ---
-    vision_poly = get_vision_polygon(player.center)
+    vision_poly = vision_cache.get_polygon(player.center, facing_angle)
     draw_light(player.center)
 
     if DEBUG:
@@ -1228,39 +1376,52 @@ while running:
         if DEBUG and player_attack_timer > PLAYER_ATTACK_COOLDOWN - 2:
             pygame.draw.rect(screen, (255, 255, 0), get_player_attack_rect(), 2)
     
-    # --- PRESSURE PLATE + DOOR (CORRECT DRAW ORDER) ---
-    pressure_plate.draw(
-        screen,
-        current_mask,
+    # --- LIGHT-GATED PROPS: one lit query for everything drawn below ---
+    hints = [(HINT_SPRITES[hint_type], pos)
+             for hint_type, positions in HINT_POSITIONS.items()
+             for pos in positions[:HINT_COUNTS[hint_type]]]
+    lit = lit_in_light(
+        [pressure_plate.door_rect, enemy.rect, ghost.rect,
+         *(pygame.Rect(pos, sprite_atlas.regions[name].size) for name, pos in hints),
+         *(box.rect for box in boxes),
+         *(trolley.rect for trolley in trolleys)],
         player.center,
         facing_angle
     )
+    door_lit, enemy_lit, ghost_lit = lit[:3]
+    hints_lit = lit[3:3 + len(hints)]
+    boxes_lit = lit[3 + len(hints):3 + len(hints) + len(boxes)]
+    trolleys_lit = lit[3 + len(hints) + len(boxes):]
+
+    # --- PRESSURE PLATE + DOOR (CORRECT DRAW ORDER) ---
+    pressure_plate.draw(screen, current_mask, door_lit)
+
+    # Lit hints and props are atlas regions: collected by name and drawn in one blits call
+    sprite_batch = []
 
     # Only show hints if Maskless
     if current_mask == MASKLESS:
-        for hint_type, positions in HINT_POSITIONS.items():
-            img = HINT_IMAGES[hint_type]
-            for pos in positions[:HINT_COUNTS[hint_type]]:
-                # Check if the center of the hint is inside the vision polygon
-                hint_rect = img.get_rect(topleft=pos)
-                hint_center = hint_rect.center
-                if point_in_polygon(hint_center, vision_poly):
-                    screen.blit(img, pos)
+        for (name, pos), hint_lit in zip(hints, hints_lit):
+            # Center of the hint inside the vision cone
+            if hint_lit:
+                sprite_batch.append((name, pos))
 
     # --- DRAW BOXES/TROLLEYS ONLY IF IN LIGHT ---
     if current_mask == 2:
-        for box in boxes:
-            if DEBUG or is_in_light(box.rect, player.center, facing_angle):
-                box.draw(screen)
-        for trolley in trolleys:
-            if DEBUG or is_in_light(trolley.rect, player.center, facing_angle):
-                trolley.draw(screen)
+        for box, box_lit in zip(boxes + trolleys, boxes_lit + trolleys_lit):
+            if DEBUG or box_lit:
+                if box.atlas_name in sprite_atlas.regions and box.active_in_game and not DEBUG:
+                    sprite_batch.append((box.atlas_name, box.rect.topleft))
+                else:
+                    box.draw(screen)
+
+    sprite_atlas.blits(screen, sprite_batch)
 
     # Draw enemies
-    enemy.draw_body(vision_poly)
+    enemy.draw_body(enemy_lit)
     enemy.draw_eyes()
 
-    if current_mask == 0 and is_in_light(ghost.rect, player.center, facing_angle):
+    if current_mask == 0 and ghost_lit:
         ghost.draw(shake_offset=(shake_offset_x, shake_offset_y))
 
     # Draw puzzle trigger (white box) only if close and has puzzle mask
@@ -1285,9 +1446,7 @@ while running:
             pygame.draw.rect(screen, (20, 20, 20), rect, 5)
 
     # Draw player on top with flipping
-    img_to_draw = current_player_img
-    if not facing_right:  # flip if moving left
-        img_to_draw = pygame.transform.flip(current_player_img, True, False)
+    img_to_draw = sprite_variants.get(current_player_img, flip_x=not facing_right)  # flip if moving left
     player_pos = (player.topleft[0] + shake_offset_x, player.topleft[1] + shake_offset_y)
     screen.blit(img_to_draw, player_pos)
 
@@ -1367,20 +1526,19 @@ while running:
         screen.blit(scan_surf, (0, 0))
 
         # Highlight platforms in radius
-        for p in platforms:
-            if p.active():
-                dx = p.rect.centerx - player.centerx
-                dy = p.rect.centery - player.centery
-                dist = math.hypot(dx, dy)
-                if dist <= scan_radius:
-                    # Draw exact shape (rectangle) as polygon
-                    points = [
-                        p.rect.topleft,
-                        p.rect.topright,
-                        p.rect.bottomright,
-                        p.rect.bottomleft
-                    ]
-                    pygame.draw.polygon(screen, SCAN_COLOR, points, 3)  # 3 = line thickness
+        for p in mask_index[current_mask].grid.query_radius(player.center, scan_radius):
+            dx = p.rect.centerx - player.centerx
+            dy = p.rect.centery - player.centery
+            dist = math.hypot(dx, dy)
+            if dist <= scan_radius:
+                # Draw exact shape (rectangle) as polygon
+                points = [
+                    p.rect.topleft,
+                    p.rect.topright,
+                    p.rect.bottomright,
+                    p.rect.bottomleft
+                ]
+                pygame.draw.polygon(screen, SCAN_COLOR, points, 3)  # 3 = line thickness
 
         if ghost.visible:
             dx = ghost.rect.centerx - player.centerx